@@ -0,0 +1,122 @@
+"""
+Pac-Man Maze Scaling Benchmark
+Measures how the cost of one simulation tick grows with the maze size.
+
+For every size a random maze is generated and a headless game is played
+by the random agent; each Game.update() call is timed on its own. A game
+that ends is restarted so every size is measured over the same number
+of ticks.
+
+Usage:
+    python pacman_maze_scaling.py
+    python pacman_maze_scaling.py --sizes 20 100 500 --ghosts 16 --ticks 5000
+    python pacman_maze_scaling.py --ghosts 400 --swarm
+    python pacman_maze_scaling.py --ghosts 400 --swarm --separate-ghosts
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, "..", "pacman"))
+
+from mazes import generate_layout, parse_count  # noqa: E402
+from pacman import SIMULATION_DT, STATE_PLAYING, Game, RandomAgent  # noqa: E402
+
+DEFAULT_SIZES = [20, 50, 100, 200]
+
+
+def time_ticks(layout, ticks, seed=0, swarm=False, separate_ghosts=False):
+    """Play a maze for a number of ticks, returns the time of each tick in seconds"""
+    game = Game(
+        headless=True,
+        seed=seed,
+        layout=layout,
+        swarm=swarm,
+        separate_ghosts=separate_ghosts,
+    )
+    agent = RandomAgent(seed=seed)
+    timings = []
+    for _ in range(ticks):
+        if game.game_state != STATE_PLAYING:
+            game.reset()
+        direction = agent(game)
+        if direction is not None:
+            game.pacman.set_direction(*direction)
+        start = time.perf_counter()
+        game.update(SIMULATION_DT)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_benchmark(sizes, ghosts, ticks, seed=0, swarm=False, separate_ghosts=False):
+    """Benchmark each maze size, returns one result dict per size"""
+    results = []
+    for size in sizes:
+        layout = generate_layout(size, size, ghosts, rng=random.Random(seed))
+        timings = time_ticks(layout, ticks, seed, swarm, separate_ghosts)
+        timings.sort()
+        results.append(
+            {
+                "size": size,
+                "tiles": size * size,
+                "mean_us": statistics.fmean(timings) * 1e6,
+                "p50_us": timings[len(timings) // 2] * 1e6,
+                "p99_us": timings[int(len(timings) * 0.99)] * 1e6,
+            }
+        )
+    return results
+
+
+def main():
+    """Entry point for the benchmark"""
+    parser = argparse.ArgumentParser(description="Pac-Man maze scaling benchmark")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="square maze sizes to measure",
+    )
+    parser.add_argument("--ghosts", type=parse_count, default=4, help="ghosts per maze")
+    parser.add_argument("--ticks", type=int, default=2000, help="ticks per size")
+    parser.add_argument("--seed", type=int, default=0, help="maze and game seed")
+    parser.add_argument(
+        "--swarm", action="store_true", help="move the ghosts with a GhostSwarm"
+    )
+    parser.add_argument(
+        "--separate-ghosts",
+        action="store_true",
+        help="push overlapping ghosts apart every tick",
+    )
+    args = parser.parse_args()
+
+    controller = "swarm" if args.swarm else "one update per ghost"
+    if args.separate_ghosts:
+        controller += ", separated"
+    print(f"{args.ghosts} ghosts ({controller}), {args.ticks} ticks per maze")
+    print(f"{'maze':>9} {'tiles':>8} {'mean us':>9} {'p50 us':>9} {'p99 us':>9}")
+    results = run_benchmark(
+        args.sizes,
+        args.ghosts,
+        args.ticks,
+        args.seed,
+        args.swarm,
+        args.separate_ghosts,
+    )
+    for result in results:
+        maze = f"{result['size']}x{result['size']}"
+        print(
+            f"{maze:>9} {result['tiles']:>8} {result['mean_us']:>9.1f} "
+            f"{result['p50_us']:>9.1f} {result['p99_us']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Pac-Man Startup Benchmark
+Measures how long Pac-Man takes from `import pacman` to its first frame,
+and when the background sound loader has finished.
+
+Every launch runs in a fresh interpreter, so import costs are included.
+Launches are measured without the audio cache and with a warm cache.
+
+Usage:
+    python pacman_startup.py
+    python pacman_startup.py --runs 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+PACMAN_DIR = os.path.join(BENCHMARK_DIR, "..", "pacman")
+
+# Runs in the child interpreter and prints its timings as JSON
+LAUNCH_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import pacman
+imported = time.perf_counter()
+game = pacman.Game(seed=1, audio_cache=sys.argv[1] or None)
+game.draw()
+first_frame = time.perf_counter()
+game.sounds.wait()
+sounds_loaded = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "first_frame": first_frame - start,
+    "sounds_loaded": sounds_loaded - start,
+}))
+"""
+
+
+def launch(audio_cache=None):
+    """Start Pac-Man in a fresh interpreter, returns its timings in seconds"""
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    output = subprocess.run(
+        [sys.executable, "-c", LAUNCH_SCRIPT, audio_cache or ""],
+        cwd=PACMAN_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def run_benchmark(runs, audio_cache=None):
+    """Launch the game several times, returns the median of each timing"""
+    launches = [launch(audio_cache) for _ in range(runs)]
+    return {key: statistics.median(run[key] for run in launches) for key in launches[0]}
+
+
+def main():
+    """Entry point for the benchmark"""
+    parser = argparse.ArgumentParser(description="Pac-Man startup benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="launches per setup")
+    args = parser.parse_args()
+
+    print(f"Median of {args.runs} launches, milliseconds since `import pacman`")
+    print(f"{'setup':>12} {'import':>8} {'frame':>8} {'sounds':>8}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        launch(cache_dir)  # Fill the cache
+        for setup, audio_cache in [("no cache", None), ("warm cache", cache_dir)]:
+            result = run_benchmark(args.runs, audio_cache)
+            print(
+                f"{setup:>12} {result['import'] * 1000:>8.1f} "
+                f"{result['first_frame'] * 1000:>8.1f} "
+                f"{result['sounds_loaded'] * 1000:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
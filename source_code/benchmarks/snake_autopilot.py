@@ -0,0 +1,128 @@
+"""
+Snake Autopilot Benchmark
+Measures how fast the autopilots play headless Snake as the board grows:
+ticks per second (the autopilot's decision plus the game update, with no
+drawing and no frame limiter) and the latency of each decision.
+
+A game that ends is restarted, and restarts are not timed, so every board
+is measured over the same number of ticks. The slowest decision includes
+the autopilot's setup (the first plan, or building the Hamiltonian cycle).
+
+Usage:
+    python snake_autopilot.py
+    python snake_autopilot.py --sizes 30 500 --autopilots astar --ticks 20000
+"""
+
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, "..", "snake"))
+
+from autopilot import AUTOPILOTS  # noqa: E402
+from snake import GRID_WIDTH, Game  # noqa: E402
+
+DEFAULT_SIZES = [GRID_WIDTH, 100, 200, 500]
+
+
+def time_ticks(autopilot_name, size, ticks, seed=0):
+    """
+    Play a board for a number of ticks. Returns the total time of the ticks,
+    the time of each decision (in seconds) and the games finished.
+    """
+    autopilot = AUTOPILOTS[autopilot_name]()
+    game = Game(headless=True, width=size, height=size, seed=seed)
+    snake_moves = game.snake.change_direction
+    decisions = []
+    games = []
+    total = 0.0
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(ticks):
+            if game.game_over:
+                games.append(game.outcome())
+                game.restart_game()
+                snake_moves = game.snake.change_direction
+            start = time.perf_counter()
+            direction = autopilot(game.snake, game.food)
+            decided = time.perf_counter()
+            snake_moves(direction)
+            game.update()
+            total += time.perf_counter() - start
+            decisions.append(decided - start)
+    finally:
+        gc.enable()
+    return total, decisions, games
+
+
+def run_benchmark(autopilot_names, sizes, ticks, seed=0):
+    """Benchmark every autopilot on every board size, returns result dicts"""
+    results = []
+    for name in autopilot_names:
+        for size in sizes:
+            total, decisions, games = time_ticks(name, size, ticks, seed)
+            decisions.sort()
+            results.append(
+                {
+                    "autopilot": name,
+                    "size": size,
+                    "ticks_per_sec": ticks / total,
+                    "mean_us": statistics.fmean(decisions) * 1e6,
+                    "p50_us": decisions[len(decisions) // 2] * 1e6,
+                    "p99_us": decisions[int(len(decisions) * 0.99)] * 1e6,
+                    "max_us": decisions[-1] * 1e6,
+                    "games": len(games),
+                    "won": games.count("won"),
+                }
+            )
+    return results
+
+
+def main():
+    """Entry point for the benchmark"""
+    parser = argparse.ArgumentParser(description="Snake autopilot benchmark")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="square board sizes to measure (even, for the hamiltonian autopilot)",
+    )
+    parser.add_argument(
+        "--autopilots",
+        nargs="+",
+        choices=AUTOPILOTS,
+        default=list(AUTOPILOTS),
+        help="autopilots to measure",
+    )
+    parser.add_argument("--ticks", type=int, default=5000, help="ticks per board")
+    parser.add_argument("--seed", type=int, default=0, help="food seed")
+    args = parser.parse_args()
+    if min(args.sizes) < 2:
+        parser.error("--sizes must be at least 2")
+    if "hamiltonian" in args.autopilots and any(size % 2 for size in args.sizes):
+        parser.error("the hamiltonian autopilot needs even --sizes")
+
+    print(f"{args.ticks} ticks per board, decision latency in microseconds")
+    print(
+        f"{'autopilot':>11} {'board':>9} {'ticks/s':>9} {'mean':>8} {'p50':>8} "
+        f"{'p99':>9} {'max':>10} {'games':>6} {'won':>4}"
+    )
+    results = run_benchmark(args.autopilots, args.sizes, args.ticks, args.seed)
+    for result in results:
+        board = f"{result['size']}x{result['size']}"
+        print(
+            f"{result['autopilot']:>11} {board:>9} {result['ticks_per_sec']:>9.0f} "
+            f"{result['mean_us']:>8.1f} {result['p50_us']:>8.1f} "
+            f"{result['p99_us']:>9.1f} {result['max_us']:>10.1f} "
+            f"{result['games']:>6} {result['won']:>4}"
+        )
+
+
+if __name__ == "__main__":
+    main()
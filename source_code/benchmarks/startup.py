@@ -0,0 +1,108 @@
+"""
+Startup Benchmark
+Measures for every game how long `import <game>` takes, how long it takes
+to get the first frame drawn, and which PyGame modules the import started
+(none should be: the games start what they need when a Game is created).
+
+Every launch runs in a fresh interpreter, so import costs are included.
+
+Usage:
+    python startup.py
+    python startup.py --runs 20 --games snake pacman
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(BENCHMARK_DIR, "..")
+
+# Game module -> folder it lives in
+GAMES = {
+    "pong": "pong",
+    "snake": "snake",
+    "space_invaders": "space_invaders",
+    "pacman": "pacman",
+}
+
+# Runs in the child interpreter and prints its timings as JSON
+LAUNCH_SCRIPT = """
+import importlib, json, sys, time
+start = time.perf_counter()
+import pygame
+pygame_imported = time.perf_counter()
+game_module = importlib.import_module(sys.argv[1])
+imported = time.perf_counter()
+started = [
+    name
+    for name in ("display", "font", "mixer", "joystick")
+    if getattr(pygame, name).get_init()
+]
+game = game_module.Game()
+game.draw()
+pygame.display.flip()  # Most games flip in their loop, not in draw()
+first_frame = time.perf_counter()
+print(json.dumps({
+    "pygame_import": pygame_imported - start,
+    "game_import": imported - pygame_imported,
+    "first_frame": first_frame - start,
+    "started_on_import": started,
+}))
+"""
+
+
+def launch(game):
+    """Start a game in a fresh interpreter, returns its timings in seconds"""
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    output = subprocess.run(
+        [sys.executable, "-c", LAUNCH_SCRIPT, game],
+        cwd=os.path.join(SOURCE_DIR, GAMES[game]),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def run_benchmark(game, runs):
+    """Launch a game several times, returns the median of each timing"""
+    launches = [launch(game) for _ in range(runs)]
+    result = {
+        key: statistics.median(run[key] for run in launches)
+        for key in ("pygame_import", "game_import", "first_frame")
+    }
+    result["started_on_import"] = launches[0]["started_on_import"]
+    return result
+
+
+def main():
+    """Entry point for the benchmark"""
+    parser = argparse.ArgumentParser(description="Game startup benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="launches per game")
+    parser.add_argument(
+        "--games", nargs="+", choices=GAMES, default=list(GAMES), help="games to run"
+    )
+    args = parser.parse_args()
+
+    print(f"Median of {args.runs} launches, milliseconds")
+    print(f"{'game':>15} {'pygame':>8} {'import':>8} {'frame':>8}  started on import")
+    for game in args.games:
+        result = run_benchmark(game, args.runs)
+        started = ", ".join(result["started_on_import"]) or "nothing"
+        print(
+            f"{game:>15} {result['pygame_import'] * 1000:>8.1f} "
+            f"{result['game_import'] * 1000:>8.1f} "
+            f"{result['first_frame'] * 1000:>8.1f}  {started}"
+        )
+
+
+if __name__ == "__main__":
+    main()
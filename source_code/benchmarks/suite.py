@@ -0,0 +1,315 @@
+"""
+Benchmark Suite
+Micro benchmarks of the games' hot paths and a full draw of every game,
+all run headless (SDL dummy drivers):
+
+- snake: Snake.move + check_collision at growing body lengths, and
+  Food.respawn on boards that are half to nearly full
+- space invaders: AlienGrid.update and Game.check_bullet_collisions
+  with many bullets in flight
+- pacman: Ghost.update in the default maze
+- draw: Game.draw of every game (Pac-Man both incremental and full)
+
+Every repeat of a case runs batches of calls, each on a freshly set up case,
+until the calls add up to a time budget (100 ms by default), so a repeat is
+long enough to even out scheduler noise. The batch size is how many calls a
+case stays representative for (bullets fly off, aliens descend). The median
+repeat is reported as ops/sec and microseconds per call: unlike the best
+one, a single lucky repeat can't set a baseline later runs never reach.
+
+Results can be saved as a baseline (a JSON file) and later runs compared
+against it: a case slower than the baseline by more than the threshold
+(and by more than a noise floor of 0.1 microseconds per call) is flagged
+and the suite exits with status 1, so a regression fails a check before
+it ships. Baselines only compare on the same machine.
+
+Usage:
+    python suite.py --save-baseline     # measure and store the baseline
+    python suite.py                     # measure and compare with it
+    python suite.py --filter snake draw --repeat 10 --threshold 0.1
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+for game_dir in ("pong", "snake", "space_invaders", "pacman"):
+    sys.path.insert(0, os.path.join(BENCHMARK_DIR, "..", game_dir))
+
+import pacman  # noqa: E402
+import pong  # noqa: E402
+import snake  # noqa: E402
+import space_invaders  # noqa: E402
+from autopilot import hamiltonian_cycle  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+
+# A case slower than the baseline by more than this fraction is a regression
+DEFAULT_THRESHOLD = 0.25
+
+# ... and by more than this many microseconds per call (timer resolution and
+# noise on the fastest cases)
+NOISE_FLOOR_US = 0.1
+
+# Minimum time spent calling a case in each repeat (seconds)
+DEFAULT_MIN_TIME = 0.1
+
+
+def snake_move(length):
+    """
+    Snake.move + check_collision, with the snake following a cycle over the
+    whole board (so it never dies and collision checks see the whole body)
+    """
+    cycle = hamiltonian_cycle(snake.GRID_WIDTH, snake.GRID_HEIGHT)
+    turns = {
+        cell: (after[0] - cell[0], after[1] - cell[1])
+        for cell, after in zip(cycle, cycle[1:] + cycle[:1])
+    }
+    player = snake.Snake(cycle[:length][::-1])
+
+    def step():
+        player.direction = turns[player.body[0]]
+        player.move()
+        player.check_collision()
+
+    return step
+
+
+def food_respawn(fill):
+    """Food.respawn with the given fraction of the board under the snake"""
+    random.seed(0)
+    cells = snake.GRID_WIDTH * snake.GRID_HEIGHT
+    cycle = hamiltonian_cycle(snake.GRID_WIDTH, snake.GRID_HEIGHT)
+    player = snake.Snake(cycle[: int(cells * fill)][::-1])
+    food = snake.Food(player.free_cells)
+    return lambda: food.respawn(player.free_cells)
+
+
+def alien_grid_update(bullets):
+    """AlienGrid.update with alien bullets spread over the top of the screen"""
+    random.seed(0)
+    grid = space_invaders.AlienGrid()
+    grid.bullets = [
+        space_invaders.Bullet(
+            random.randrange(space_invaders.SCREEN_WIDTH),
+            random.randrange(space_invaders.SCREEN_HEIGHT // 2),
+            -1,
+        )
+        for _ in range(bullets)
+    ]
+    return grid.update
+
+
+def bullet_collisions(bullets):
+    """
+    Game.check_bullet_collisions with player bullets below the aliens
+    (none hit, so every bullet is tested against every alien)
+    """
+    game = space_invaders.Game()
+    game.player.bullets = [
+        space_invaders.Bullet(
+            x % space_invaders.SCREEN_WIDTH, space_invaders.SCREEN_HEIGHT - 100, 1
+        )
+        for x in range(0, bullets * 7, 7)
+    ]
+    return game.check_bullet_collisions
+
+
+def ghost_update():
+    """Ghost.update chasing Pacman in the default maze"""
+    game = pacman.Game(headless=True, seed=0)
+    ghost = next(iter(game.ghosts))
+    return lambda: ghost.update(game.maze, game.pacman, False, pacman.SIMULATION_DT)
+
+
+def pacman_draw(full):
+    """Pac-Man's Game.draw, redrawing only the actors or the whole screen"""
+    game = pacman.Game(seed=0, audio=False)
+    game.draw()
+
+    def draw():
+        game.needs_full_redraw = full
+        game.draw()
+
+    return draw
+
+
+def game_draw(module):
+    """Game.draw of one of the small games"""
+    return module.Game().draw
+
+
+# Case name -> (function returning the callable to time, calls per setup).
+# Cases whose state doesn't drift get batches of several milliseconds, so
+# setting up again is rare; the alien grid changes as it runs and is set up
+# again every 40 calls.
+CASES = {
+    "snake.move length=4": (lambda: snake_move(4), 10000),
+    "snake.move length=100": (lambda: snake_move(100), 10000),
+    "snake.move length=450": (lambda: snake_move(450), 10000),
+    "snake.move length=890": (lambda: snake_move(890), 10000),
+    "snake.respawn fill=50%": (lambda: food_respawn(0.5), 10000),
+    "snake.respawn fill=90%": (lambda: food_respawn(0.9), 10000),
+    "snake.respawn fill=99%": (lambda: food_respawn(0.99), 10000),
+    "invaders.alien_grid bullets=10": (lambda: alien_grid_update(10), 40),
+    "invaders.alien_grid bullets=200": (lambda: alien_grid_update(200), 40),
+    "invaders.collisions bullets=10": (lambda: bullet_collisions(10), 2000),
+    "invaders.collisions bullets=100": (lambda: bullet_collisions(100), 500),
+    "pacman.ghost_update": (ghost_update, 2000),
+    "draw.pong": (lambda: game_draw(pong), 200),
+    "draw.snake": (lambda: game_draw(snake), 200),
+    "draw.space_invaders": (lambda: game_draw(space_invaders), 200),
+    "draw.pacman": (lambda: pacman_draw(False), 5000),
+    "draw.pacman full": (lambda: pacman_draw(True), 100),
+}
+
+
+def time_repeat(setup, calls, min_time):
+    """
+    Time batches of calls, each on a fresh setup (not timed), until they add
+    up to min_time. Returns the time per call in seconds.
+    """
+    elapsed = 0.0
+    total_calls = 0
+    gc.collect()
+    gc.disable()
+    try:
+        while elapsed < min_time:
+            operation = setup()
+            start = time.perf_counter()
+            for _ in range(calls):
+                operation()
+            elapsed += time.perf_counter() - start
+            total_calls += calls
+    finally:
+        gc.enable()
+    return elapsed / total_calls
+
+
+def time_case(setup, calls, repeat, min_time=DEFAULT_MIN_TIME):
+    """Median time per call in seconds over the repeats"""
+    return statistics.median(time_repeat(setup, calls, min_time) for _ in range(repeat))
+
+
+def run_suite(names, repeat, min_time=DEFAULT_MIN_TIME):
+    """Time the named cases, returns one result dict per case"""
+    results = []
+    for name in names:
+        setup, calls = CASES[name]
+        seconds = time_case(setup, calls, repeat, min_time)
+        results.append(
+            {"name": name, "us_per_call": seconds * 1e6, "ops_per_sec": 1 / seconds}
+        )
+    return results
+
+
+def load_baseline(path):
+    """Case name -> microseconds per call from a saved baseline ({} if none)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baseline(path, results):
+    """Store the microseconds per call of every case"""
+    baseline = load_baseline(path)  # Keep cases that were filtered out
+    baseline.update({result["name"]: result["us_per_call"] for result in results})
+    with open(path, "w") as baseline_file:
+        json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+
+
+def main():
+    """Entry point for the benchmark suite"""
+    parser = argparse.ArgumentParser(description="Game benchmark suite")
+    parser.add_argument(
+        "--filter",
+        nargs="+",
+        metavar="TEXT",
+        help="only run cases whose name contains one of these",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="repeats per case (the median counts)"
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=DEFAULT_MIN_TIME,
+        help="seconds of calls per repeat (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--baseline", default=DEFAULT_BASELINE, help="baseline file to compare with"
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="store the results as the baseline instead of comparing",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="slowdown that counts as a regression (0.25 = 25%% slower)",
+    )
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = parser.parse_args()
+
+    names = [
+        name
+        for name in CASES
+        if not args.filter or any(text in name for text in args.filter)
+    ]
+    if args.list:
+        print("\n".join(names))
+        return
+    if not names:
+        parser.error("no case matches the filter")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.min_time <= 0:
+        parser.error("--min-time must be positive")
+
+    baseline = {} if args.save_baseline else load_baseline(args.baseline)
+    print(f"Median of {args.repeat} repeats of at least {args.min_time:g}s")
+    print(
+        f"{'case':<34} {'ops/sec':>11} {'us/call':>10} {'baseline':>10} {'change':>8}"
+    )
+    results = run_suite(names, args.repeat, args.min_time)
+    regressions = []
+    for result in results:
+        name = result["name"]
+        line = (
+            f"{name:<34} {result['ops_per_sec']:>11.0f} {result['us_per_call']:>10.2f}"
+        )
+        if name in baseline:
+            change = result["us_per_call"] / baseline[name] - 1
+            line += f" {baseline[name]:>10.2f} {change:>+8.0%}"
+            slower_us = result["us_per_call"] - baseline[name]
+            if change > args.threshold and slower_us > NOISE_FLOOR_US:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+    elif not baseline:
+        print("No baseline to compare with (save one with --save-baseline)")
+    if regressions:
+        print(
+            f"{len(regressions)} case(s) slower than the baseline by over "
+            f"{args.threshold:.0%}"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+Shared helpers for the games in source_code.
+
+The games are run as scripts from their own folders, so each one adds
+source_code to sys.path before importing from this package.
+"""
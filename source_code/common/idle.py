@@ -0,0 +1,22 @@
+"""
+Idle Mode
+Paused, game over and win screens don't change until the player presses
+something, so redrawing them at full frame rate only burns CPU. The game
+loops draw such a screen and then sleep in wait_for_events() until input
+arrives, which takes the CPU use of a waiting game close to zero.
+"""
+
+import pygame
+
+
+def wait_for_events(timeout=None):
+    """
+    Sleep until an event arrives, returns it with any others already queued.
+    With a timeout (in seconds) it gives up after that long and returns [].
+    """
+    if timeout is None:
+        return [pygame.event.wait()] + pygame.event.get()
+    event = pygame.event.wait(max(1, int(timeout * 1000)))
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
@@ -0,0 +1,149 @@
+"""
+Frame Profiler
+Times every phase of a game loop frame (events, input, update, draw, flip
+and the frame limiter's tick) and keeps the latest samples of each in a
+fixed-size ring buffer. Pressing F3 in a game shows the rolling p50, p95
+and p99 of every phase, so a stutter can be traced to the game logic, the
+drawing or waiting on the display while playing.
+
+The game loop calls start_frame() at the top, lap(phase) after each phase
+and end_frame() once the frame is done. Timing is always on: a lap costs
+about a microsecond, and the overlay is only rendered while it is shown.
+With a tracer (see tracer.py) every lap and frame is also traced as a span.
+"""
+
+import time
+
+import pygame
+
+# Frames of history per phase (a few seconds at the games' frame rates)
+HISTORY = 240
+
+# Key that shows and hides the overlay
+TOGGLE_KEY = pygame.K_F3
+
+# Seconds between refreshes of the overlay's numbers
+OVERLAY_REFRESH = 0.25
+
+OVERLAY_BACKGROUND = (20, 20, 20)
+OVERLAY_TEXT = (220, 220, 220)
+OVERLAY_HEADER = (255, 255, 0)
+OVERLAY_FONT_SIZE = 22
+OVERLAY_COLUMNS = ["ms", "p50", "p95", "p99"]  # Phase names go under "ms"
+OVERLAY_COLUMN_WIDTHS = [70, 50, 50, 50]  # pixels
+OVERLAY_PADDING = 6
+
+
+class RingBuffer:
+    """The latest samples of one measurement, oldest overwritten first"""
+
+    def __init__(self, size=HISTORY):
+        self.samples = [0.0] * size
+        self.index = 0  # Where the next sample goes
+        self.count = 0
+
+    def add(self, value):
+        """Store a sample, dropping the oldest one if the buffer is full"""
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % len(self.samples)
+        if self.count < len(self.samples):
+            self.count += 1
+
+    def percentiles(self, *percents):
+        """The given percentiles (0-100) of the stored samples"""
+        if self.count == 0:
+            return [0.0] * len(percents)
+        values = sorted(self.samples[: self.count])
+        last = self.count - 1
+        return [
+            values[min(last, int(percent / 100 * self.count))] for percent in percents
+        ]
+
+
+class FrameProfiler:
+    """Per-phase frame timings with an overlay showing their percentiles"""
+
+    def __init__(self, history=HISTORY, tracer=None):
+        self.history = history
+        self.tracer = tracer  # Gets every lap as a span when tracing
+        self.phases = {}  # Phase name -> RingBuffer, in the order first timed
+        self.frame_start = self.last = time.perf_counter()
+        self.visible = False
+        self.font = None  # Created the first time the overlay is shown
+        self.overlay = None
+        self.overlay_time = 0.0
+
+    def start_frame(self):
+        """Start timing a frame (time since the last frame is not counted)"""
+        self.frame_start = self.last = time.perf_counter()
+
+    def lap(self, phase):
+        """Record the time since the previous lap (or the frame start) for a phase"""
+        now = time.perf_counter()
+        self.record(phase, now - self.last)
+        if self.tracer is not None:
+            self.tracer.span(phase, self.last, now)
+        self.last = now
+
+    def end_frame(self):
+        """Record the time of the whole frame, from start_frame() to the last lap"""
+        self.record("frame", self.last - self.frame_start)
+        if self.tracer is not None:
+            self.tracer.span("frame", self.frame_start, self.last)
+
+    def record(self, phase, seconds):
+        """Add a sample for a phase"""
+        samples = self.phases.get(phase)
+        if samples is None:
+            samples = self.phases[phase] = RingBuffer(self.history)
+        samples.add(seconds)
+
+    def stats(self):
+        """Phase -> (p50, p95, p99) in milliseconds"""
+        return {
+            phase: tuple(value * 1000 for value in samples.percentiles(50, 95, 99))
+            for phase, samples in self.phases.items()
+        }
+
+    def toggle(self):
+        """Show or hide the overlay"""
+        self.visible = not self.visible
+        self.overlay = None
+
+    def draw(self, surface, **position):
+        """
+        Draw the overlay if it is shown, placed with Rect keywords
+        (e.g. topright=(790, 10)). Returns the rect drawn, or None.
+        """
+        if not self.visible:
+            return None
+        now = time.perf_counter()
+        if self.overlay is None or now - self.overlay_time >= OVERLAY_REFRESH:
+            self.overlay = self.render_overlay()
+            self.overlay_time = now
+        rect = self.overlay.get_rect(**position)
+        surface.blit(self.overlay, rect)
+        return rect
+
+    def render_overlay(self):
+        """Render the table of percentiles (opaque, so it can be drawn over itself)"""
+        if self.font is None:
+            self.font = pygame.font.Font(None, OVERLAY_FONT_SIZE)
+        line_height = self.font.get_linesize()
+        rows = [(OVERLAY_COLUMNS, OVERLAY_HEADER)]
+        for phase, percentiles in self.stats().items():
+            cells = [phase] + [f"{value:.2f}" for value in percentiles]
+            rows.append((cells, OVERLAY_TEXT))
+
+        width = sum(OVERLAY_COLUMN_WIDTHS) + 2 * OVERLAY_PADDING
+        height = len(rows) * line_height + 2 * OVERLAY_PADDING
+        overlay = pygame.Surface((width, height))
+        overlay.fill(OVERLAY_BACKGROUND)
+        y = OVERLAY_PADDING
+        for cells, color in rows:
+            x = OVERLAY_PADDING
+            for cell, column_width in zip(cells, OVERLAY_COLUMN_WIDTHS):
+                overlay.blit(self.font.render(cell, True, color), (x, y))
+                x += column_width
+            y += line_height
+        return overlay
@@ -0,0 +1,60 @@
+"""
+Text Cache
+Rendering text is one of the slowest things a frame does, yet HUD text
+rarely changes between frames. TextCache keeps rendered strings around
+and only rasterises a string again when its value actually changes.
+"""
+
+from collections import OrderedDict
+
+# Rendered strings kept per cache (scores and timers that have changed
+# are dropped, least recently used first)
+MAX_CACHED_TEXTS = 256
+
+
+class TextCache:
+    """Renders (font, text, color) once and reuses the surface afterwards.
+
+    Static labels are pre-rendered with pin() and are never evicted, every
+    other string lives in a bounded LRU cache.
+    """
+
+    def __init__(self, max_size=MAX_CACHED_TEXTS):
+        self.max_size = max_size
+        self.pinned = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def pin(self, font, text, color):
+        """Pre-render a static label that stays cached for the whole game"""
+        key = (font, text, color)
+        surface = self.surfaces.pop(key, None) or font.render(text, True, color)
+        self.pinned[key] = surface
+        return surface
+
+    def render(self, font, text, color):
+        """Get the rendered text, rendering it only if it isn't cached"""
+        key = (font, text, color)
+        surface = self.pinned.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Forget all rendered text, including pinned labels"""
+        self.pinned.clear()
+        self.surfaces.clear()
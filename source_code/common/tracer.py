@@ -0,0 +1,137 @@
+"""
+Frame Tracer
+Records a whole session's timeline for offline analysis: a span for every
+phase of every frame (events, update, draw, flip, ...), spans for the parts
+of an update (the ghost AI, the alien grid, ...) and markers for game
+events (pellet eaten, life lost, restart, ...).
+
+Tracing is opt-in. Set GAME_TRACE to a file name before starting a game:
+
+    GAME_TRACE=pong.json python pong.py
+
+A .jsonl file gets one JSON event per line. Any other name gets the Chrome
+trace event format, which chrome://tracing and https://ui.perfetto.dev
+open directly (they also read a file cut short by a crash).
+
+The game thread only appends tuples to a list. Every full batch goes to a
+background thread that formats and writes it, so the trace barely changes
+the frames it measures.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+
+# Environment variable naming the trace file
+TRACE_VARIABLE = "GAME_TRACE"
+
+# Events handed to the writer thread at a time (small batches keep the
+# writer's share of the interpreter lock short)
+BATCH_SIZE = 256
+
+# Chrome trace events need a process and a thread, everything runs on one
+PROCESS_ID = 1
+THREAD_ID = 1
+
+
+class Tracer:
+    """Buffered writer of trace spans and markers"""
+
+    def __init__(self, path, name="game"):
+        self.path = path
+        self.lines = path.endswith(".jsonl")  # Otherwise Chrome trace format
+        self.origin = time.perf_counter()  # Timestamps count from here
+        self.events = []  # (kind, name, start, duration, args) not yet handed over
+        self.batches = queue.Queue()
+        self.file = open(path, "w")
+        self.writer = threading.Thread(target=self.write_batches, daemon=True)
+        self.writer.start()
+        # Name the process in trace viewers
+        self.add(("M", "process_name", self.origin, 0.0, {"name": name}))
+
+    def now(self):
+        """The current time, for starting a span"""
+        return time.perf_counter()
+
+    def span(self, name, start, end=None):
+        """Record a span from start (a now() time) to end or now, returns its end"""
+        if end is None:
+            end = time.perf_counter()
+        self.add(("X", name, start, end - start, None))
+        return end
+
+    def marker(self, name, **args):
+        """Record an instant event, with optional details"""
+        self.add(("i", name, time.perf_counter(), 0.0, args or None))
+
+    def add(self, event):
+        """Buffer an event, handing a full batch to the writer"""
+        self.events.append(event)
+        if len(self.events) >= BATCH_SIZE:
+            self.batches.put(self.events)
+            self.events = []
+
+    def close(self):
+        """Write out the remaining events and finish the file"""
+        if self.writer is None:
+            return
+        self.batches.put(self.events)
+        self.events = []
+        self.batches.put(None)
+        self.writer.join()
+        self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def to_json(self, event):
+        """Format an event as a Chrome trace event (times in microseconds)"""
+        kind, name, start, duration, args = event
+        data = {
+            "name": name,
+            "ph": kind,
+            "ts": round((start - self.origin) * 1e6, 3),
+            "pid": PROCESS_ID,
+            "tid": THREAD_ID,
+        }
+        if kind == "X":
+            data["dur"] = round(duration * 1e6, 3)
+        elif kind == "i":
+            data["s"] = "t"  # A marker on the thread's own track
+        if args is not None:
+            data["args"] = args
+        return json.dumps(data, separators=(",", ":"))
+
+    def write_batches(self):
+        """Format and write batches until close() (runs on the writer thread)"""
+        with self.file:
+            if not self.lines:
+                self.file.write("[\n")
+            first = True
+            while True:
+                batch = self.batches.get()
+                if batch is None:
+                    break
+                if not batch:
+                    continue
+                text = [self.to_json(event) for event in batch]
+                if self.lines:
+                    self.file.write("\n".join(text) + "\n")
+                else:
+                    self.file.write(("" if first else ",\n") + ",\n".join(text))
+                first = False
+            if not self.lines:
+                self.file.write("\n]\n")
+
+
+def open_tracer(path=None, name="game"):
+    """A Tracer writing to path (or the GAME_TRACE file), None if neither is set"""
+    path = path or os.environ.get(TRACE_VARIABLE)
+    if not path:
+        return None
+    return Tracer(path, name)
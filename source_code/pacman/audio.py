@@ -0,0 +1,110 @@
+"""
+Pac-Man Audio
+Starts the mixer and decodes the sound effects on a background thread, so
+the first frame is on screen while audio is still loading. Sounds played
+before loading has finished are skipped.
+
+Decoded sound effects can be cached on disk as raw PCM. Later launches
+load the PCM directly instead of decoding the MP3 files again. The music
+is streamed by the mixer and never needs decoding up front.
+"""
+
+import os
+import threading
+
+import pygame
+
+# Sound effect name -> volume (files are sounds/<name>.mp3)
+SOUND_EFFECTS = {"eatpill": 0.5, "dead": 0.7}
+MUSIC_FILE = "music.mp3"
+MUSIC_VOLUME = 0.3
+
+
+class SoundBank:
+    """Sound effects and music that load in the background"""
+
+    def __init__(self, sounds_dir, cache_dir=None):
+        self.sounds_dir = sounds_dir
+        self.cache_dir = cache_dir
+        self.sounds = {}  # name -> Sound, filled in by the loader thread
+        self.music_loaded = False
+        self.music_wanted = False  # Whether the game wants music playing
+        self.lock = threading.Lock()  # Guards the music state
+        self.thread = threading.Thread(target=self.load, daemon=True)
+
+    def start(self):
+        """Start loading in the background"""
+        self.thread.start()
+
+    def wait(self, timeout=None):
+        """Block until loading has finished, returns False on timeout"""
+        self.thread.join(timeout)
+        return not self.thread.is_alive()
+
+    def load(self):
+        """Start the mixer and load everything (runs on the loader thread)"""
+        try:
+            pygame.mixer.init()
+
+            with self.lock:
+                pygame.mixer.music.load(os.path.join(self.sounds_dir, MUSIC_FILE))
+                pygame.mixer.music.set_volume(MUSIC_VOLUME)
+                self.music_loaded = True
+                if self.music_wanted:
+                    pygame.mixer.music.play(-1)  # -1 means loop indefinitely
+
+            for name, volume in SOUND_EFFECTS.items():
+                sound = self.load_sound(name)
+                sound.set_volume(volume)
+                self.sounds[name] = sound
+        except Exception as e:
+            print(f"Warning: Could not load sounds: {e}")
+
+    def load_sound(self, name):
+        """Decode a sound effect, going through the PCM cache if there is one"""
+        path = os.path.join(self.sounds_dir, f"{name}.mp3")
+        if self.cache_dir is None:
+            return pygame.mixer.Sound(path)
+
+        # Raw PCM only fits the mixer format it was decoded for
+        frequency, size, channels = pygame.mixer.get_init()
+        cache_path = os.path.join(
+            self.cache_dir, f"{name}.{frequency}.{size}.{channels}.pcm"
+        )
+        try:
+            if os.path.getmtime(cache_path) >= os.path.getmtime(path):
+                with open(cache_path, "rb") as cache_file:
+                    return pygame.mixer.Sound(buffer=cache_file.read())
+        except OSError:
+            pass  # Not cached yet
+
+        sound = pygame.mixer.Sound(path)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write then rename, so an interrupted write never looks cached
+            with open(cache_path + ".tmp", "wb") as cache_file:
+                cache_file.write(sound.get_raw())
+            os.replace(cache_path + ".tmp", cache_path)
+        except OSError as e:
+            print(f"Warning: Could not cache {name}: {e}")
+        return sound
+
+    def play(self, name):
+        """Play a sound effect, if it has been loaded"""
+        sound = self.sounds.get(name)
+        if sound is not None:
+            sound.play()
+
+    def play_music(self):
+        """Start the music looping (as soon as it is loaded)"""
+        with self.lock:
+            self.music_wanted = True
+            if self.music_loaded:
+                pygame.mixer.music.play(-1)
+
+    def stop_music(self):
+        """Stop the music"""
+        with self.lock:
+            self.music_wanted = False
+            if self.music_loaded:
+                pygame.mixer.music.stop()
@@ -0,0 +1,137 @@
+"""
+Pac-Man Batch Simulator
+Plays many seeded headless Pac-Man games across all CPU cores and reports
+aggregate results (win rate, score distribution, survival time).
+
+Usage:
+    python batch.py --games 1000
+    python batch.py --games 200 --workers 4 --first-seed 1000
+    python batch.py --games 50 --generate 100x100 --ghosts 12 --maze-seed 7
+"""
+
+import argparse
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from pacman import (
+    SIMULATION_DT,
+    SIMULATION_MAX_TICKS,
+    RandomAgent,
+    add_game_arguments,
+    game_options_from_args,
+    run_headless,
+)
+
+
+def play_seed(seed, max_ticks=SIMULATION_MAX_TICKS, dt=SIMULATION_DT, **game_options):
+    """Play one headless game; the seed drives both the game and the agent"""
+    agent = RandomAgent(seed=seed)
+    result = run_headless(max_ticks, dt, agent, seed=seed, **game_options)
+    result["seed"] = seed
+    return result
+
+
+def run_batch(
+    seeds,
+    max_ticks=SIMULATION_MAX_TICKS,
+    dt=SIMULATION_DT,
+    workers=None,
+    **game_options,
+):
+    """
+    Play one game per seed in a process pool, returns the results in seed order.
+    game_options are passed on to Game (layout, swarm, ...).
+    """
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    # Hand out seeds in chunks so workers are not starved by IPC overhead
+    chunksize = max(1, len(seeds) // (workers * 4))
+    play = partial(play_seed, max_ticks=max_ticks, dt=dt, **game_options)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(play, seeds, chunksize=chunksize))
+
+
+def summarize(results, dt=SIMULATION_DT):
+    """Aggregate per-game results into win rate, score and survival statistics"""
+    scores = [result["score"] for result in results]
+    ticks = [result["ticks"] for result in results]
+    outcomes = {"won": 0, "lost": 0, "timeout": 0}
+    for result in results:
+        outcomes[result["outcome"]] += 1
+
+    if len(scores) > 1:
+        score_quartiles = statistics.quantiles(scores, n=4)
+    else:
+        score_quartiles = scores * 3
+
+    return {
+        "games": len(results),
+        "outcomes": outcomes,
+        "win_rate": outcomes["won"] / len(results),
+        "score_mean": statistics.fmean(scores),
+        "score_stdev": statistics.pstdev(scores),
+        "score_min": min(scores),
+        "score_quartiles": score_quartiles,
+        "score_max": max(scores),
+        "survival_mean_ticks": statistics.fmean(ticks),
+        "survival_mean_seconds": statistics.fmean(ticks) * dt,
+    }
+
+
+def print_summary(summary):
+    """Print a summary as a small report"""
+    outcomes = summary["outcomes"]
+    q1, median, q3 = summary["score_quartiles"]
+    print(f"Games:    {summary['games']}")
+    print(
+        f"Outcomes: {outcomes['won']} won, {outcomes['lost']} lost, "
+        f"{outcomes['timeout']} timed out"
+    )
+    print(f"Win rate: {summary['win_rate']:.1%}")
+    print(
+        f"Score:    mean {summary['score_mean']:.1f} "
+        f"(stdev {summary['score_stdev']:.1f})"
+    )
+    print(
+        f"          min {summary['score_min']} | q1 {q1:g} | median {median:g} "
+        f"| q3 {q3:g} | max {summary['score_max']}"
+    )
+    print(
+        f"Survival: mean {summary['survival_mean_ticks']:.0f} ticks "
+        f"({summary['survival_mean_seconds']:.1f}s of game time)"
+    )
+
+
+def main():
+    """Entry point for the batch simulator"""
+    parser = argparse.ArgumentParser(description="Pac-Man batch simulator")
+    parser.add_argument("--games", type=int, default=100, help="number of games")
+    parser.add_argument("--first-seed", type=int, default=0, help="seed of game 1")
+    parser.add_argument(
+        "--workers", type=int, help="worker processes (default: all CPU cores)"
+    )
+    parser.add_argument(
+        "--ticks",
+        type=int,
+        default=SIMULATION_MAX_TICKS,
+        help="maximum number of ticks per game",
+    )
+    parser.add_argument(
+        "--dt", type=float, default=SIMULATION_DT, help="fixed simulation step (s)"
+    )
+    add_game_arguments(parser)
+    args = parser.parse_args()
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+    game_options = game_options_from_args(parser, args)
+
+    seeds = range(args.first_seed, args.first_seed + args.games)
+    results = run_batch(seeds, args.ticks, args.dt, args.workers, **game_options)
+    print_summary(summarize(results, args.dt))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Pac-Man Environment
+Wraps a headless Pac-Man game in the reset()/step() API used by
+reinforcement learning libraries (the Gym style, without depending on it):
+
+    env = PacmanEnv(seed=1)
+    observation = env.reset()
+    observation, reward, done, info = env.step(action)
+
+An action is an index into ACTIONS (0 keeps the current direction). The
+reward is the score gained during the step. A step runs ticks_per_step
+simulation ticks, and with the swept movement large dt values are fine.
+
+Observations are picked per env (needing NumPy for the arrays):
+- "state": a dict with the tiles of Pacman and the ghosts (the default)
+- "grid": a uint8 tile grid of walls, pellets, ghosts and Pacman
+- "pixels": the rendered frame as a (height, width, 3) uint8 array. This is
+  the live render target, redrawn by every step: copy it to keep a frame.
+
+VecEnv steps several independent games in one call, SubprocVecEnv spreads
+them over worker processes. Both reset a game as soon as it is done.
+
+Usage:
+    python env.py --envs 16 --steps 2000
+    python env.py --envs 16 --steps 2000 --workers 4 --dt 0.1
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import time
+
+from pacman import (
+    SIMULATION_DT,
+    SIMULATION_MAX_TICKS,
+    MAZE,
+    STATE_PLAYING,
+    Game,
+    add_game_arguments,
+    game_options_from_args,
+    parse_layout,
+    screen_size_for,
+)
+from observations import PixelTarget, TileGrid
+
+# Action index -> player action (None keeps the current direction)
+ACTIONS = [None, "up", "down", "left", "right"]
+
+# Kinds of observation an env can return (see the module docstring)
+OBSERVATIONS = ["state", "grid", "pixels"]
+
+
+class PacmanEnv:
+    """One headless game behind a reset()/step() interface"""
+
+    def __init__(
+        self,
+        ticks_per_step=1,
+        dt=SIMULATION_DT,
+        max_ticks=SIMULATION_MAX_TICKS,
+        seed=None,
+        observation="state",
+        tile_codes=None,
+        **game_options,
+    ):
+        if observation not in OBSERVATIONS:
+            raise ValueError(f"Unknown observation: {observation}")
+        self.observation = observation
+        self.tile_grid = TileGrid(tile_codes) if observation == "grid" else None
+        self.pixel_target = None
+        self.ticks_per_step = ticks_per_step
+        self.dt = dt
+        self.max_ticks = max_ticks  # Longer episodes end as a timeout
+        self.game_options = game_options  # Passed on to Game (layout, swarm, ...)
+        self.seed = seed  # Seed of the first episode
+        self.game = None
+        self.ticks = 0
+
+    def reset(self, seed=None):
+        """
+        Start a new episode, returns the first observation. Without a seed
+        the game's generator carries on, so a seeded env stays reproducible.
+        """
+        if self.game is None:
+            if seed is None:
+                seed = self.seed
+            render_target = None
+            if self.observation == "pixels":
+                layout = self.game_options.get("layout") or parse_layout(MAZE)
+                self.pixel_target = PixelTarget(*screen_size_for(layout))
+                render_target = self.pixel_target.surface
+            self.game = Game(
+                headless=True,
+                seed=seed,
+                render_target=render_target,
+                **self.game_options,
+            )
+        else:
+            # Reuse the game (and its sprite atlas), reseeded like a new one
+            if seed is not None:
+                self.game.seed = seed
+                self.game.rng.seed(seed)
+            self.game.reset()
+        self.ticks = 0
+        return self.observe()
+
+    def step(self, action):
+        """
+        Apply an action and run the game for one step.
+        Returns (observation, reward, done, info).
+        """
+        game = self.game
+        if ACTIONS[action] is not None:
+            game.apply_action(ACTIONS[action])
+
+        score = game.score
+        for _ in range(self.ticks_per_step):
+            game.update(self.dt)
+            self.ticks += 1
+            if game.game_state != STATE_PLAYING or self.ticks >= self.max_ticks:
+                break
+
+        done = game.game_state != STATE_PLAYING or self.ticks >= self.max_ticks
+        info = {"score": game.score, "ticks": self.ticks}
+        if done:
+            info["outcome"] = game.outcome()
+        return self.observe(), game.score - score, done, info
+
+    def observe(self):
+        """The observation of the current game state"""
+        if self.observation == "grid":
+            return self.tile_grid.observe(self.game)
+        if self.observation == "pixels":
+            self.game.draw()
+            return self.pixel_target.pixels
+        return self.state()
+
+    def state(self):
+        """The game state as tiles: Pacman, the ghosts and what is left to eat"""
+        game = self.game
+        maze = game.maze
+        pacman = game.pacman
+        return {
+            "pacman": maze.tile_at(*pacman.rect.center),
+            "direction": (pacman.dx, pacman.dy),
+            "ghosts": [maze.tile_at(*ghost.rect.center) for ghost in game.ghosts],
+            "powered_up": game.power_up_timer if game.is_powered_up else 0.0,
+            "pellets_left": maze.pellets_left,
+        }
+
+
+class VecEnv:
+    """Several independent games stepped together in this process"""
+
+    def __init__(self, num_envs, **env_options):
+        self.envs = [PacmanEnv(**env_options) for _ in range(num_envs)]
+
+    def __len__(self):
+        return len(self.envs)
+
+    def reset(self, seed=None):
+        """Start every game, env i gets seed + i. Returns the observations"""
+        return [
+            env.reset(None if seed is None else seed + index)
+            for index, env in enumerate(self.envs)
+        ]
+
+    def step(self, actions):
+        """
+        Step every game with its action.
+        Returns lists of observations, rewards, dones and infos. A finished
+        game is reset straight away: its observation is the new episode's
+        first one, and info["final_observation"] holds the last one.
+        """
+        observations, rewards, dones, infos = [], [], [], []
+        for env, action in zip(self.envs, actions):
+            observation, reward, done, info = env.step(action)
+            if done:
+                if env.observation == "pixels":
+                    # The render target is about to show the next episode
+                    observation = observation.copy()
+                info["final_observation"] = observation
+                observation = env.reset()
+            observations.append(observation)
+            rewards.append(reward)
+            dones.append(done)
+            infos.append(info)
+        return observations, rewards, dones, infos
+
+    def close(self):
+        """Nothing to release (SubprocVecEnv stops its workers here)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def run_worker(connection, num_envs, env_options):
+    """Serve reset/step commands for a VecEnv (runs in a worker process)"""
+    envs = VecEnv(num_envs, **env_options)
+    while True:
+        command, argument = connection.recv()
+        if command == "reset":
+            connection.send(envs.reset(argument))
+        elif command == "step":
+            connection.send(envs.step(argument))
+        elif command == "close":
+            connection.close()
+            return
+
+
+class SubprocVecEnv:
+    """Like VecEnv, with the games split across worker processes"""
+
+    def __init__(self, num_envs, workers=None, **env_options):
+        workers = min(num_envs, workers or os.cpu_count() or 1)
+        # Every worker steps a contiguous slice of the games
+        self.slices = []
+        start = 0
+        for worker in range(workers):
+            count = num_envs // workers + (worker < num_envs % workers)
+            self.slices.append((start, start + count))
+            start += count
+
+        self.connections = []
+        self.processes = []
+        for first, last in self.slices:
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=run_worker,
+                args=(worker_connection, last - first, env_options),
+                daemon=True,
+            )
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+        self.num_envs = num_envs
+
+    def __len__(self):
+        return self.num_envs
+
+    def reset(self, seed=None):
+        """Start every game, env i gets seed + i. Returns the observations"""
+        for connection, (first, _) in zip(self.connections, self.slices):
+            connection.send(("reset", None if seed is None else seed + first))
+        observations = []
+        for connection in self.connections:
+            observations.extend(connection.recv())
+        return observations
+
+    def step(self, actions):
+        """Step every game with its action (see VecEnv.step)"""
+        actions = list(actions)
+        # Send to all workers first so they step their games in parallel
+        for connection, (first, last) in zip(self.connections, self.slices):
+            connection.send(("step", actions[first:last]))
+        observations, rewards, dones, infos = [], [], [], []
+        for connection in self.connections:
+            worker_results = connection.recv()
+            observations.extend(worker_results[0])
+            rewards.extend(worker_results[1])
+            dones.extend(worker_results[2])
+            infos.extend(worker_results[3])
+        return observations, rewards, dones, infos
+
+    def close(self):
+        """Stop the worker processes"""
+        for connection in self.connections:
+            try:
+                connection.send(("close", None))
+                connection.close()
+            except OSError:
+                pass  # The worker is gone already
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    """Step random actions through a vectorised env and report the speed"""
+    parser = argparse.ArgumentParser(description="Pac-Man environment benchmark")
+    parser.add_argument("--envs", type=int, default=8, help="games stepped together")
+    parser.add_argument("--steps", type=int, default=1000, help="steps per game")
+    parser.add_argument(
+        "--workers", type=int, help="worker processes (default: step in-process)"
+    )
+    parser.add_argument(
+        "--ticks-per-step", type=int, default=1, help="simulation ticks per step"
+    )
+    parser.add_argument(
+        "--dt", type=float, default=SIMULATION_DT, help="fixed simulation step (s)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of env 1")
+    parser.add_argument(
+        "--observation", choices=OBSERVATIONS, default="state", help="observation"
+    )
+    add_game_arguments(parser)
+    args = parser.parse_args()
+    env_options = game_options_from_args(parser, args)
+    env_options.update(
+        ticks_per_step=args.ticks_per_step, dt=args.dt, observation=args.observation
+    )
+
+    if args.workers:
+        envs = SubprocVecEnv(args.envs, args.workers, **env_options)
+    else:
+        envs = VecEnv(args.envs, **env_options)
+    rng = random.Random(args.seed)
+    episodes = 0
+    with envs:
+        envs.reset(args.seed)
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            actions = [rng.randrange(len(ACTIONS)) for _ in range(args.envs)]
+            _, _, dones, _ = envs.step(actions)
+            episodes += sum(dones)
+        elapsed = time.perf_counter() - start
+
+    steps = args.steps * args.envs
+    print(f"{steps} steps in {elapsed:.2f}s: {steps / elapsed:.0f} steps/s")
+    print(
+        f"{steps * args.ticks_per_step * args.dt / elapsed:.0f}x real time, "
+        f"{episodes} episodes finished"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Pac-Man Maze Layouts
+Loading maze files and generating random mazes of any size.
+
+A layout is a list of equally long strings, one per row, using the same
+characters as the built-in MAZE in pacman.py:
+- X is a wall
+- . is a pellet, P is a power pellet, a space is an empty corridor
+- S is pacman's start position, G is a ghost's start position
+
+An open tile on the outer edge makes a tunnel to the opposite side. Short
+rows in a maze file are padded with walls.
+"""
+
+import argparse
+import random
+from collections import deque
+
+# Smallest maze the generator can build (walls all around one corridor loop)
+MIN_SIZE = 5
+
+# Fraction of dead ends opened up so the maze has loops, like a Pac-Man maze
+BRAID_RATIO = 0.8
+
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+
+
+def parse_layout(text):
+    """Turn maze text into a layout, skipping blank lines and walling up short rows"""
+    lines = [line.rstrip("\r") for line in text.split("\n")]
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        raise ValueError("Maze has no rows")
+    width = max(len(line) for line in lines)
+    # Padding with walls: open padding would punch a tunnel through the outer wall
+    return [line.ljust(width, "X") for line in lines]
+
+
+def validate_layout(layout):
+    """Check that a layout can be played, raises ValueError if not"""
+    text = "".join(layout)
+    unknown = set(text) - set("X.P SG")
+    if unknown:
+        raise ValueError(f"Unknown maze characters: {''.join(sorted(unknown))}")
+    if text.count("S") != 1:
+        raise ValueError("Maze needs exactly one pacman start (S)")
+    if "." not in text and "P" not in text:
+        raise ValueError("Maze has no pellets to eat")
+
+    # Every pellet must be reachable, or the maze can never be won
+    width = len(layout[0])
+    row, col = divmod(text.index("S"), width)
+    reachable = tile_distances(layout, (col, row))
+    for row, line in enumerate(layout):
+        for col, char in enumerate(line):
+            if char in ".P" and (col, row) not in reachable:
+                raise ValueError(
+                    f"Pellet at column {col}, row {row} can't be reached from S"
+                )
+
+
+def load_layout(path):
+    """Read and validate a maze file"""
+    with open(path) as maze_file:
+        layout = parse_layout(maze_file.read())
+    validate_layout(layout)
+    return layout
+
+
+def generate_layout(width, height, ghosts=4, power_pellets=4, rng=None):
+    """
+    Generate a random maze where every open tile can be reached.
+    A perfect maze is carved with a randomised depth-first search, then
+    most dead ends are opened up so ghosts can't corner pacman that easily.
+    """
+    if width < MIN_SIZE or height < MIN_SIZE:
+        raise ValueError(f"Mazes must be at least {MIN_SIZE}x{MIN_SIZE}")
+    if ghosts < 0:
+        raise ValueError("A maze can't have a negative number of ghosts")
+    rng = rng or random.Random()
+    grid = [["X"] * width for _ in range(height)]
+
+    # Corridors run through odd coordinates, walls sit on even ones
+    cells_wide = (width - 1) // 2
+    cells_high = (height - 1) // 2
+    start = (rng.randrange(cells_wide), rng.randrange(cells_high))
+    visited = {start}
+    stack = [start]
+    grid[2 * start[1] + 1][2 * start[0] + 1] = "."
+    while stack:
+        cell_x, cell_y = stack[-1]
+        neighbours = [
+            (cell_x + dx, cell_y + dy)
+            for dx, dy in DIRECTIONS
+            if 0 <= cell_x + dx < cells_wide
+            and 0 <= cell_y + dy < cells_high
+            and (cell_x + dx, cell_y + dy) not in visited
+        ]
+        if not neighbours:
+            stack.pop()
+            continue
+        next_x, next_y = rng.choice(neighbours)
+        # Knock down the wall between the two cells
+        grid[cell_y + next_y + 1][cell_x + next_x + 1] = "."
+        grid[2 * next_y + 1][2 * next_x + 1] = "."
+        visited.add((next_x, next_y))
+        stack.append((next_x, next_y))
+
+    open_dead_ends(grid, rng)
+
+    # Pacman starts in the top left corridor, ghosts as far away as possible
+    open_tiles = [
+        (col, row)
+        for row in range(height)
+        for col in range(width)
+        if grid[row][col] == "."
+    ]
+    start_tile = open_tiles[0]
+    grid[start_tile[1]][start_tile[0]] = "S"
+
+    distances = tile_distances(grid, start_tile)
+    by_distance = sorted(open_tiles[1:], key=lambda tile: -distances[tile])
+    far_half = by_distance[: max(ghosts, len(by_distance) // 2)]
+    for col, row in rng.sample(far_half, min(ghosts, len(far_half))):
+        grid[row][col] = "G"
+
+    # Power pellets go on the open tiles closest to the corners
+    corners = [(0, 0), (width - 1, 0), (0, height - 1), (width - 1, height - 1)]
+    for corner_x, corner_y in corners[:power_pellets]:
+        pellet_tiles = [tile for tile in open_tiles if grid[tile[1]][tile[0]] == "."]
+        if not pellet_tiles:
+            break
+        col, row = min(
+            pellet_tiles,
+            key=lambda tile: abs(tile[0] - corner_x) + abs(tile[1] - corner_y),
+        )
+        grid[row][col] = "P"
+
+    return ["".join(row) for row in grid]
+
+
+def open_dead_ends(grid, rng):
+    """Remove a wall next to most dead ends, joining them to another corridor"""
+    height = len(grid)
+    width = len(grid[0])
+    for row in range(1, height - 1, 2):
+        for col in range(1, width - 1, 2):
+            walls = [
+                (dx, dy) for dx, dy in DIRECTIONS if grid[row + dy][col + dx] == "X"
+            ]
+            if len(walls) < 3 or rng.random() > BRAID_RATIO:
+                continue
+            # Only knock through to a corridor, never through the outer wall
+            walls = [
+                (dx, dy)
+                for dx, dy in walls
+                if 0 < col + 2 * dx < width - 1 and 0 < row + 2 * dy < height - 1
+            ]
+            if walls:
+                dx, dy = rng.choice(walls)
+                grid[row + dy][col + dx] = "."
+
+
+def tile_distances(grid, start):
+    """
+    Breadth-first distances from a tile to every reachable open tile,
+    through the edge tunnels like Maze.compute_distances in pacman.py
+    """
+    height = len(grid)
+    width = len(grid[0])
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        col, row = queue.popleft()
+        for dx, dy in DIRECTIONS:
+            tile = ((col + dx) % width, (row + dy) % height)
+            if tile not in distances and grid[tile[1]][tile[0]] != "X":
+                distances[tile] = distances[(col, row)] + 1
+                queue.append(tile)
+    return distances
+
+
+def parse_size(text):
+    """Parse a WIDTHxHEIGHT size like 200x200 (for command line options)"""
+    width, _, height = text.lower().partition("x")
+    try:
+        return int(width), int(height or width)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {text!r}") from None
+
+
+def parse_count(text):
+    """Parse a count of zero or more (for command line options)"""
+    try:
+        count = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid count: {text!r}") from None
+    if count < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {count}")
+    return count
+
+
+def add_maze_arguments(parser):
+    """Add the maze selection options to a command line parser"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--maze", metavar="FILE", help="load the maze from a file")
+    group.add_argument(
+        "--generate",
+        metavar="WxH",
+        type=parse_size,
+        help="play a randomly generated maze of this size, e.g. 200x200",
+    )
+    parser.add_argument(
+        "--ghosts", type=parse_count, default=4, help="ghosts in a generated maze"
+    )
+    parser.add_argument(
+        "--maze-seed", type=int, help="random seed for the generated maze"
+    )
+
+
+def layout_from_args(args):
+    """Get the layout picked with add_maze_arguments, or None for the default"""
+    if args.maze:
+        return load_layout(args.maze)
+    if args.generate:
+        width, height = args.generate
+        rng = random.Random(args.maze_seed)
+        return generate_layout(width, height, args.ghosts, rng=rng)
+    return None
@@ -0,0 +1,105 @@
+"""
+Pac-Man Observations
+NumPy arrays of a game for agents and analytics, built without copying:
+
+- PixelTarget is a surface for Game(render_target=...) that shares its
+  memory with a (height, width, 3) uint8 array, so every drawn frame is
+  already an array.
+- TileGrid turns the game state into a (height, width) uint8 grid of
+  walls, pellets, ghosts and Pacman, without rendering anything.
+
+NumPy is optional: the game only needs it for these observations.
+"""
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+# Default tile grid values (TileGrid takes a dict to change them)
+TILE_CODES = {
+    "empty": 0,
+    "wall": 1,
+    "pellet": 2,
+    "power_pellet": 3,
+    "ghost": 4,
+    "vulnerable_ghost": 5,
+    "pacman": 6,
+}
+
+
+class PixelTarget:
+    """Off-screen surface whose pixels are a NumPy array"""
+
+    def __init__(self, width, height):
+        if np is None:
+            raise ImportError("Pixel observations need NumPy (pip install numpy)")
+        # pygame.surfarray.pixels3d() gives a zero-copy view too, but it
+        # locks the surface while the array lives and a locked surface can't
+        # be drawn on. A surface drawn straight into an array has no lock.
+        self.buffer = np.zeros((height, width, 4), dtype=np.uint8)
+        self.surface = pygame.image.frombuffer(self.buffer, (width, height), "RGBX")
+        # (height, width, RGB) view, updated in place by every draw
+        self.pixels = self.buffer[:, :, :3]
+
+
+class TileGrid:
+    """Builds the tile grid observation of a game"""
+
+    def __init__(self, codes=None):
+        if np is None:
+            raise ImportError("Tile grid observations need NumPy (pip install numpy)")
+        self.codes = {**TILE_CODES, **(codes or {})}
+        self.maze = None
+
+    def set_maze(self, maze):
+        """Prepare the static part of the grid for a maze"""
+        codes = self.codes
+        self.maze = maze
+        shape = (maze.height, maze.width)
+        # A view of the maze's own pellet grid: it follows every pellet eaten
+        self.pellets = np.frombuffer(maze.pellets, dtype=np.uint8).reshape(shape)
+        walls = np.frombuffer(b"".join(maze.walls), dtype=np.uint8).reshape(shape)
+        # Pellet kind + 3 * wall -> code (pellets are never on walls)
+        self.kind = walls * np.uint8(3)
+        self.kind_codes = np.array(
+            [
+                codes["empty"],
+                codes["pellet"],
+                codes["power_pellet"],
+                codes["wall"],
+            ],
+            dtype=np.uint8,
+        )
+        self.scratch = np.empty(shape, dtype=np.uint8)
+
+    def observe(self, game):
+        """The grid for the game's current state (a new array every call)"""
+        maze = game.maze
+        if maze is not self.maze:
+            self.set_maze(maze)
+
+        np.add(self.kind, self.pellets, out=self.scratch)
+        grid = self.kind_codes[self.scratch]
+
+        cell_size = maze.cell_size
+        ghost_code = self.codes["vulnerable_ghost" if game.is_powered_up else "ghost"]
+        swarm = game.swarm
+        if swarm is not None:
+            # The swarm has every ghost position in arrays already
+            half = swarm.size // 2
+            cols = (np.trunc(swarm.x).astype(np.int64) + half) // cell_size
+            rows = (np.trunc(swarm.y).astype(np.int64) + half - swarm.top) // cell_size
+            grid[rows % maze.height, cols % maze.width] = ghost_code
+        else:
+            for ghost in game.ghosts:
+                col, row = maze.tile_at(*ghost.rect.center)
+                grid[row, col] = ghost_code
+
+        col, row = maze.tile_at(*game.pacman.rect.center)
+        grid[row, col] = self.codes["pacman"]
+        return grid
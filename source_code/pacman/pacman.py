@@ -8,22 +8,37 @@ Controls:
 - R: Restart game
 """
 
+import argparse
+import importlib.util
+import json
+import math
 import pygame
 import sys
 import random
 import os
+from collections import deque
 
-# Initialize PyGame
-pygame.init()
-pygame.mixer.init()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from audio import SoundBank  # noqa: E402
+from common.idle import wait_for_events  # noqa: E402
+from common.profiler import TOGGLE_KEY, FrameProfiler  # noqa: E402
+from common.text_cache import TextCache  # noqa: E402
+from common.tracer import open_tracer  # noqa: E402
+from mazes import add_maze_arguments, layout_from_args, parse_layout  # noqa: E402
+from spatial import SpatialHash  # noqa: E402
+
+# PyGame is initialised by Game: headless games need no subsystems at all,
+# and the mixer is started by the background sound loader
 
 # Constants
-SCREEN_WIDTH = 800
+SCREEN_WIDTH = 800  # Largest window, smaller mazes get a smaller one
 SCREEN_HEIGHT = 840  # Extra space for score display
+SOUNDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sounds")
 FPS = 30  # Target frame rate (game is frame-rate independent)
-GRID_WIDTH = 20
-GRID_HEIGHT = 20
-CELL_SIZE = min(SCREEN_WIDTH // GRID_WIDTH, (SCREEN_HEIGHT - 40) // GRID_HEIGHT)
+TICK_RATE = 60  # Simulation steps per second, independent of the frame rate
+MAX_FRAME_TIME = 0.1  # Longest frame the simulation catches up on (seconds)
+CELL_SIZE = 40  # Tile size, shrunk for mazes that don't fit the screen
+MIN_CELL_SIZE = 4  # Tiles never get smaller (bigger mazes get a bigger window)
 SCORE_HEIGHT = 40
 
 # Colors
@@ -37,20 +52,49 @@ CYAN = (0, 255, 255)
 ORANGE = (255, 165, 0)
 GREEN = (0, 255, 0)
 
-# Game speeds (in pixels per second for frame-rate independence)
+# Ghost colours (normal, then the cycle used while vulnerable)
+GHOST_COLORS = [RED, PINK, CYAN, ORANGE]
+VULNERABLE_COLORS = [BLUE, WHITE, YELLOW]
+
+# Game speeds (in pixels per second for frame-rate independence,
+# scaled with the tile size when a maze uses smaller tiles than CELL_SIZE)
 PACMAN_SPEED = 120  # pixels per second (2 pixels/frame at 60 FPS)
 GHOST_SPEED = 72  # pixels per second (1.2 pixels/frame at 60 FPS)
 GHOST_SPEED_VARIATION = 0.1  # 10% random speed variation per ghost
+# How far from a tile centre Pacman can be to turn a corner (at CELL_SIZE)
+CORNER_TOLERANCE = 8  # pixels
 
 # Power-up duration
 POWER_UP_DURATION = 5.0  # seconds
 
+# Fixed simulation step and headless simulation limit
+SIMULATION_DT = 1.0 / TICK_RATE  # seconds
+SIMULATION_MAX_TICKS = 5 * 60 * TICK_RATE  # five minutes of game time
+
+# Player actions (as recorded in input logs)
+ACTION_DIRECTIONS = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}
+ACTION_RESTART = "restart"
+DIRECTION_ACTIONS = {
+    direction: action for action, direction in ACTION_DIRECTIONS.items()
+}
+
 # Game states
 STATE_PLAYING = 0
 STATE_GAME_OVER = 1
 STATE_WON = 2
 
-# CELL x CELL Maze
+# Pellet kinds stored in the maze's pellet grid
+NO_PELLET = 0
+PELLET = 1  # Regular pellet - gives points when eaten
+POWER_PELLET = 2  # Gives points and makes ghosts vulnerable
+PELLET_POINTS = {PELLET: 10, POWER_PELLET: 50}
+PELLET_SIZES = {PELLET: 10, POWER_PELLET: 12}  # At CELL_SIZE
+PELLET_COLORS = {PELLET: WHITE, POWER_PELLET: YELLOW}
+
+# Distance field value for tiles that cannot reach Pac-Man
+UNREACHABLE = -1
+
+# Default maze (see mazes.py for maze files and generated mazes)
 # X is a WALL
 # S is pacman's start position
 # G is a ghost's start position
@@ -79,68 +123,239 @@ XXXXXXXX.XXXXXXXXXXX
 """
 
 
-class Wall(pygame.sprite.Sprite):
-    """Wall sprite - blocks movement"""
-
-    def __init__(self, x, y):
-        super().__init__()
-        self.image = pygame.Surface((CELL_SIZE, CELL_SIZE))
-        self.image.fill(BLUE)
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y + SCORE_HEIGHT
-
-
-class Pellet(pygame.sprite.Sprite):
-    """Regular pellet - gives points when eaten"""
-
-    def __init__(self, x, y):
-        super().__init__()
-        self.image = pygame.Surface((10, 10))
-        self.image.fill(WHITE)
-        self.rect = self.image.get_rect()
-        self.rect.centerx = x + CELL_SIZE // 2
-        self.rect.centery = y + CELL_SIZE // 2 + SCORE_HEIGHT
-        self.points = 10
-
-
-class PowerPellet(pygame.sprite.Sprite):
-    """Power pellet - gives points and makes ghosts vulnerable"""
-
-    def __init__(self, x, y):
-        super().__init__()
-        self.image = pygame.Surface((12, 12))
-        self.image.fill(YELLOW)
-        self.rect = self.image.get_rect()
-        self.rect.centerx = x + CELL_SIZE // 2
-        self.rect.centery = y + CELL_SIZE // 2 + SCORE_HEIGHT
-        self.points = 50
-
-
-class Pacman(pygame.sprite.Sprite):
-    """Pacman sprite - player controlled character"""
-
-    def __init__(self, x, y):
-        super().__init__()
-        self.size = CELL_SIZE - 10  # Make pacman smaller
-        self.base_image = None
-        self.image = None
-        self.rect = None
-        self.create_pacman_image(mouth_open=True)
-        self.rect.x = x + 5
-        self.rect.y = y + 5 + SCORE_HEIGHT
-        self.start_x = x + 5
-        self.start_y = y + 5
-        self.dx = 0
-        self.dy = 0
-        self.next_dx = 0
-        self.next_dy = 0
-        self.mouth_open = True
-        self.mouth_timer = 0
-
-    def create_pacman_image(self, mouth_open=True):
-        """Create pacman sprite that looks like a pizza slice"""
-        size = self.size
+def cell_size_for(width, height):
+    """Largest tile size (up to CELL_SIZE) that fits a maze in the window"""
+    fit = min(SCREEN_WIDTH // width, (SCREEN_HEIGHT - SCORE_HEIGHT) // height)
+    return max(MIN_CELL_SIZE, min(CELL_SIZE, fit))
+
+
+def screen_size_for(layout):
+    """Window size (width, height) of a game on a maze layout"""
+    height = len(layout)
+    width = max(len(line) for line in layout)
+    cell_size = cell_size_for(width, height)
+    return width * cell_size, height * cell_size + SCORE_HEIGHT
+
+
+class Maze:
+    """Tile-indexed wall and pellet grids built from the maze layout.
+
+    Collision queries only look at the 1-4 tiles a rect overlaps, and eating
+    is a single tile lookup, so neither depends on the size of the maze. The
+    maze also keeps a BFS distance field towards Pac-Man that all ghosts share.
+    """
+
+    def __init__(self, lines):
+        self.height = len(lines)
+        self.width = max(len(line) for line in lines)
+        self.cell_size = cell_size_for(self.width, self.height)
+        self.pixel_width = self.width * self.cell_size
+        self.pixel_height = self.height * self.cell_size
+        # One bytearray per row: 1 = wall, 0 = open
+        self.walls = [
+            bytearray(1 if char == "X" else 0 for char in line.ljust(self.width))
+            for line in lines
+        ]
+        # Pellet kind per tile (flat, indexed by row * width + col)
+        pellet_kinds = {".": PELLET, "P": POWER_PELLET}
+        self.pellets = bytearray(
+            pellet_kinds.get(char, NO_PELLET)
+            for line in lines
+            for char in line.ljust(self.width)
+        )
+        self.pellets_left = self.width * self.height - self.pellets.count(NO_PELLET)
+        # Distance field (flat list indexed by row * width + col)
+        self.distance_target = None
+        self.distances = []
+
+    def tile_at(self, x, y):
+        """Get the (col, row) tile containing a screen position"""
+        # Wrap so positions inside the tunnels map onto the opposite edge
+        col = int(x // self.cell_size) % self.width
+        row = int((y - SCORE_HEIGHT) // self.cell_size) % self.height
+        return col, row
+
+    def is_wall(self, col, row):
+        """Check if a tile is a wall (tiles outside the maze are open)"""
+        if 0 <= row < self.height and 0 <= col < self.width:
+            return self.walls[row][col] == 1
+        return False
+
+    def collides(self, rect):
+        """Check if a rect overlaps any wall tile"""
+        # Same edge semantics as Rect.colliderect: touching is not overlapping
+        cell_size = self.cell_size
+        left = rect.left // cell_size
+        right = (rect.right - 1) // cell_size
+        top = (rect.top - SCORE_HEIGHT) // cell_size
+        bottom = (rect.bottom - 1 - SCORE_HEIGHT) // cell_size
+
+        for row in range(max(top, 0), min(bottom, self.height - 1) + 1):
+            walls = self.walls[row]
+            for col in range(max(left, 0), min(right, self.width - 1) + 1):
+                if walls[col]:
+                    return True
+        return False
+
+    def free_distance(self, rect, position, dx, dy, distance):
+        """
+        How far (up to distance) a rect can move in direction (dx, dy) before
+        it touches a wall. position is the exact coordinate the rect's left
+        (moving sideways) or top (moving up/down) edge was truncated from.
+        """
+        cell_size = self.cell_size
+        if dx != 0:
+            direction, origin, size, tile_count = dx, 0, rect.width, self.width
+        else:
+            direction, origin = dy, SCORE_HEIGHT
+            size, tile_count = rect.height, self.height
+
+        # Tiles the leading edge enters on the way (usually none)
+        start = int(position) - origin
+        if direction > 0:
+            first = (start + size - 1) // cell_size + 1
+            last = (int(position + distance) - origin + size - 1) // cell_size
+            tiles = range(max(first, 0), min(last, tile_count - 1) + 1)
+        else:
+            first = start // cell_size - 1
+            last = (int(position - distance) - origin) // cell_size
+            tiles = range(min(first, tile_count - 1), max(last, 0) - 1, -1)
+        if not tiles:
+            return distance
+
+        # Stop at the first of them with a wall beside the rect
+        if dx != 0:
+            top = (rect.top - SCORE_HEIGHT) // cell_size
+            bottom = (rect.bottom - 1 - SCORE_HEIGHT) // cell_size
+            rows = self.walls[max(top, 0) : min(bottom, self.height - 1) + 1]
+            wall = next((col for col in tiles if any(row[col] for row in rows)), None)
+        else:
+            left = max(rect.left // cell_size, 0)
+            right = min((rect.right - 1) // cell_size, self.width - 1) + 1
+            walls = self.walls
+            wall = next((row for row in tiles if any(walls[row][left:right])), None)
+        if wall is None:
+            return distance
+
+        # Rects are truncated like pygame.Rect, so wall faces are whole pixels
+        if direction > 0:
+            face = wall * cell_size + origin - size
+            return min(distance, max(0.0, face - position))
+        face = (wall + 1) * cell_size + origin
+        return min(distance, max(0.0, position - face))
+
+    def pellet_at(self, col, row):
+        """Get the kind of pellet on a tile (NO_PELLET if there is none)"""
+        return self.pellets[row * self.width + col]
+
+    def eat_pellet(self, col, row):
+        """Remove the pellet on a tile, returns its kind (NO_PELLET if there was none)"""
+        index = row * self.width + col
+        kind = self.pellets[index]
+        if kind != NO_PELLET:
+            self.pellets[index] = NO_PELLET
+            self.pellets_left -= 1
+        return kind
+
+    def distances_from(self, tile):
+        """Get the distance field towards a tile, recomputing it only if the tile changed"""
+        if tile != self.distance_target:
+            self.distance_target = tile
+            self.distances = self.compute_distances(tile)
+        return self.distances
+
+    def compute_distances(self, tile):
+        """Breadth-first search over open tiles (including wraparound tunnels)"""
+        width = self.width
+        height = self.height
+        distances = [UNREACHABLE] * (width * height)
+        col, row = tile
+        if self.walls[row][col]:
+            return distances
+
+        distances[row * width + col] = 0
+        queue = deque([tile])
+        while queue:
+            col, row = queue.popleft()
+            next_distance = distances[row * width + col] + 1
+            for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+                next_col = (col + dx) % width
+                next_row = (row + dy) % height
+                index = next_row * width + next_col
+                if (
+                    distances[index] == UNREACHABLE
+                    and not self.walls[next_row][next_col]
+                ):
+                    distances[index] = next_distance
+                    queue.append((next_col, next_row))
+        return distances
+
+    def distance(self, distances, col, row):
+        """Look up a tile in a distance field (wrapping at the maze edges)"""
+        return distances[(row % self.height) * self.width + col % self.width]
+
+
+class SpriteAtlas:
+    """Pre-rendered sprite images for Pacman and the ghosts.
+
+    Every mouth state in every direction and every ghost colour is drawn once
+    at startup, so animations only swap references to existing surfaces.
+    """
+
+    # Directions pacman can face ((0, 0) when standing still)
+    PACMAN_DIRECTIONS = [(0, 0), (1, 0), (-1, 0), (0, 1), (0, -1)]
+
+    def __init__(self, cell_size=CELL_SIZE):
+        # Sprites keep their proportions to the tile (30px and 36px at 40px)
+        self.cell_size = cell_size
+        self.pacman_size = max(1, cell_size * 3 // 4)  # Make pacman smaller
+        self.ghost_size = max(1, cell_size * 9 // 10)
+
+        # (mouth_open, (dx, dy)) -> Surface
+        self.pacman_frames = {}
+        for mouth_open in (True, False):
+            base_image = self.draw_pacman(self.pacman_size, mouth_open)
+            for direction in self.PACMAN_DIRECTIONS:
+                self.pacman_frames[(mouth_open, direction)] = self.orient(
+                    base_image, direction
+                )
+
+        # color -> Surface
+        self.ghost_images = {}
+        for color in GHOST_COLORS + VULNERABLE_COLORS:
+            self.ghost_images[color] = self.draw_ghost(self.ghost_size, color)
+
+    def pacman_image(self, mouth_open, dx, dy):
+        """Get the pacman frame for a mouth state and movement direction"""
+        return self.pacman_frames[(mouth_open, (dx, dy))]
+
+    def ghost_image(self, color):
+        """Get the ghost image for a colour (drawing it once if it is new)"""
+        image = self.ghost_images.get(color)
+        if image is None:
+            image = self.draw_ghost(self.ghost_size, color)
+            self.ghost_images[color] = image
+        return image
+
+    @staticmethod
+    def orient(base_image, direction):
+        """Rotate or flip the right-facing pacman image towards a direction"""
+        dx, dy = direction
+        if dx < 0:
+            # Left - flip horizontally instead of rotating
+            return pygame.transform.flip(base_image, True, False)
+        elif dy > 0:
+            # Down - rotate 270 degrees
+            return pygame.transform.rotate(base_image, 270)
+        elif dy < 0:
+            # Up - rotate 90 degrees
+            return pygame.transform.rotate(base_image, 90)
+        # Right or not moving - use original
+        return base_image
+
+    @staticmethod
+    def draw_pacman(size, mouth_open=True):
+        """Draw a pacman sprite that looks like a pizza slice"""
         # Create surface with transparency
         surface = pygame.Surface((size, size), pygame.SRCALPHA)
         surface.fill((0, 0, 0, 0))  # Transparent background
@@ -167,152 +382,14 @@ class Pacman(pygame.sprite.Sprite):
         # Draw eye (black dot)
         eye_x = center - radius // 3
         eye_y = center - radius // 3
-        pygame.draw.rect(surface, BLACK, (eye_x, eye_y, 4, 4))
-
-        self.base_image = surface
-        self.image = self.base_image.copy()
-        if self.rect is None:
-            self.rect = self.image.get_rect()
-
-    def update(self, walls, dt=0):
-        """Update Pacman position with collision detection"""
-        # Update mouth animation
-        self.mouth_timer += dt
-        if self.mouth_timer >= 0.1:
-            self.mouth_timer = 0
-            self.mouth_open = not self.mouth_open
-            self.create_pacman_image(self.mouth_open)
-            # Update rotation/flip based on direction
-            old_center = self.rect.center
-
-            if self.dx > 0:
-                # Right - use original image
-                self.image = self.base_image.copy()
-            elif self.dx < 0:
-                # Left - flip horizontally instead of rotating
-                self.image = pygame.transform.flip(self.base_image, True, False)
-            elif self.dy > 0:
-                # Down - rotate 270 degrees
-                self.image = pygame.transform.rotate(self.base_image, 270)
-            elif self.dy < 0:
-                # Up - rotate 90 degrees
-                self.image = pygame.transform.rotate(self.base_image, 90)
-            else:
-                # Not moving - use original
-                self.image = self.base_image.copy()
-
-            # Update rect to maintain position after transformation
-            self.rect = self.image.get_rect()
-            self.rect.center = old_center
-
-        # Try to change direction if a new direction was requested
-        if self.next_dx != 0 or self.next_dy != 0:
-            test_x = self.rect.x + self.next_dx * PACMAN_SPEED * dt
-            test_y = self.rect.y + self.next_dy * PACMAN_SPEED * dt
-
-            # Create a test rect to check collision
-            test_rect = self.rect.copy()
-            test_rect.x = test_x
-            test_rect.y = test_y
-
-            # Check if the new direction is valid
-            collision = False
-            for wall in walls:
-                if test_rect.colliderect(wall.rect):
-                    collision = True
-                    break
-
-            if not collision:
-                self.dx = self.next_dx
-                self.dy = self.next_dy
-                self.next_dx = 0
-                self.next_dy = 0
-
-        # Move in current direction (frame-rate independent)
-        if self.dx != 0 or self.dy != 0:
-            new_x = self.rect.x + self.dx * PACMAN_SPEED * dt
-            new_y = self.rect.y + self.dy * PACMAN_SPEED * dt
-
-            # Create a test rect
-            test_rect = self.rect.copy()
-            test_rect.x = new_x
-            test_rect.y = new_y
-
-            # Check collision with walls
-            collision = False
-            for wall in walls:
-                if test_rect.colliderect(wall.rect):
-                    collision = True
-                    break
-
-            if not collision:
-                self.rect.x = new_x
-                self.rect.y = new_y
-            else:
-                # Stop if hit a wall
-                self.dx = 0
-                self.dy = 0
+        eye_size = max(1, size // 7)
+        pygame.draw.rect(surface, BLACK, (eye_x, eye_y, eye_size, eye_size))
 
-        # Check for wraparound at maze edges (teleport to opposite side)
-        # The playable maze is from y=SCORE_HEIGHT to y=SCORE_HEIGHT+maze_height
-        maze_width = GRID_WIDTH * CELL_SIZE
-        maze_height = GRID_HEIGHT * CELL_SIZE
-
-        # Horizontal wraparound
-        if self.rect.right < 0:  # Gone off left edge
-            self.rect.x = maze_width
-        elif self.rect.left > maze_width:  # Gone off right edge
-            self.rect.x = -self.rect.width
-
-        # Vertical wraparound (score area is NOT part of the playable maze)
-        if self.rect.top < SCORE_HEIGHT:  # Gone into/above score area (top of screen)
-            self.rect.y = maze_height + SCORE_HEIGHT - self.rect.height
-        elif self.rect.top > maze_height + SCORE_HEIGHT:  # Gone off bottom edge
-            self.rect.y = SCORE_HEIGHT
-
-    def set_direction(self, dx, dy):
-        """Set the next direction to move"""
-        self.next_dx = dx
-        self.next_dy = dy
-
-    def reset(self):
-        """Reset Pacman to starting position"""
-        self.rect.x = self.start_x
-        self.rect.y = self.start_y + SCORE_HEIGHT
-        self.dx = 0
-        self.dy = 0
-        self.next_dx = 0
-        self.next_dy = 0
-        self.mouth_open = True
-        self.mouth_timer = 0
-
-
-class Ghost(pygame.sprite.Sprite):
-    """Ghost sprite - enemy that chases Pacman"""
-
-    def __init__(self, x, y, color):
-        super().__init__()
-        self.size = CELL_SIZE - 4
-        self.color = color
-        self.original_color = color
-        self.vulnerable_colors = [BLUE, WHITE, YELLOW]
-        self.color_index = 0
-        self.color_timer = 0
-        # Add random speed variation (up to 5%)
-        speed_multiplier = 1.0 + random.uniform(0, GHOST_SPEED_VARIATION)
-        self.speed = GHOST_SPEED * speed_multiplier
-        self.image = self.create_ghost_image(color)
-        self.rect = self.image.get_rect()
-        self.rect.x = x + 2
-        self.rect.y = y + 2 + SCORE_HEIGHT
-        self.start_x = x + 2
-        self.start_y = y + 2
-        self.dx = random.choice([-1, 1])
-        self.dy = 0
+        return surface
 
-    def create_ghost_image(self, color):
-        """Create a ghost sprite with rounded top and wavy bottom"""
-        size = self.size
+    @staticmethod
+    def draw_ghost(size, color):
+        """Draw a ghost sprite with rounded top and wavy bottom"""
         surface = pygame.Surface((size, size), pygame.SRCALPHA)
         surface.fill((0, 0, 0, 0))  # Transparent background
 
@@ -354,8 +431,252 @@ class Ghost(pygame.sprite.Sprite):
 
         return surface
 
-    def update(self, walls, pacman, vulnerable=False, dt=0):
+
+class Actor(pygame.sprite.Sprite):
+    """Moving sprite with a float position that can be drawn between two ticks.
+
+    The simulation moves x/y in fixed steps and keeps rect in sync for
+    collisions. prev_x/prev_y hold the position of the previous tick, so
+    the renderer can interpolate and stay smooth at any frame rate.
+
+    Actors move along the grid: a step is swept up to the wall in front and
+    is split at every tile centre passed on the way, where the actor can
+    turn. Long steps (large dt) therefore neither tunnel nor miss a corner.
+    """
+
+    def place(self, x, y):
+        """Move to a position without interpolating from the old one"""
+        self.x = self.prev_x = float(x)
+        self.y = self.prev_y = float(y)
+        self.rect.x = int(self.x)
+        self.rect.y = int(self.y)
+
+    def move_to(self, x, y):
+        """Move to a new position during a simulation tick"""
+        self.x = x
+        self.y = y
+        self.rect.x = int(x)
+        self.rect.y = int(y)
+
+    def start_tick(self):
+        """Remember where we were before this simulation tick"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def interpolate(self, alpha):
+        """Put the rect between the previous and current tick (for drawing)"""
+        self.rect.x = int(self.prev_x + (self.x - self.prev_x) * alpha)
+        self.rect.y = int(self.prev_y + (self.y - self.prev_y) * alpha)
+
+    def lane_origin(self, vertical):
+        """Screen coordinate of the first tile centre line along an axis"""
+        return SCORE_HEIGHT + self.margin if vertical else self.margin
+
+    def nearest_lane(self, cell_size, vertical):
+        """Coordinate (x or y) at which the actor is centred in its nearest tile"""
+        origin = self.lane_origin(vertical)
+        position = self.y if vertical else self.x
+        return round((position - origin) / cell_size) * cell_size + origin
+
+    def lane_distance(self, cell_size):
+        """Distance ahead to where the actor is next centred in a tile"""
+        vertical = self.dy != 0
+        position = self.y if vertical else self.x
+        offset = (position - self.lane_origin(vertical)) % cell_size
+        if (self.dy if vertical else self.dx) > 0:
+            return cell_size - offset
+        return offset or cell_size
+
+    def advance(self, maze, distance):
+        """
+        Move up to distance in the current direction, stopping at the next
+        tile centre or at a wall, whichever comes first.
+        Returns the distance moved and whether a wall was in the way.
+        """
+        vertical = self.dy != 0
+        position = self.y if vertical else self.x
+        lane = self.lane_distance(maze.cell_size)
+        step = min(distance, lane)
+        moved = maze.free_distance(self.rect, position, self.dx, self.dy, step)
+        if moved == lane:
+            # Centre lines are whole pixels: land on it, not a rounding error away
+            position = round(position + (self.dy or self.dx) * lane)
+        else:
+            position += (self.dy or self.dx) * moved
+        if vertical:
+            self.move_to(self.x, position)
+        else:
+            self.move_to(position, self.y)
+        return moved, moved < step
+
+    def wrap_around(self, maze):
+        """Check for wraparound at maze edges (teleport to opposite side)"""
+        # The playable maze is from y=SCORE_HEIGHT to y=SCORE_HEIGHT+maze_height
+        maze_width = maze.pixel_width
+        maze_height = maze.pixel_height
+        x = self.x
+        y = self.y
+
+        # Horizontal wraparound
+        if self.rect.right < 0:  # Gone off left edge
+            x = maze_width
+        elif self.rect.left > maze_width:  # Gone off right edge
+            x = -self.rect.width
+
+        # Vertical wraparound (score area is NOT part of the playable maze)
+        if self.rect.top < SCORE_HEIGHT:  # Gone into/above score area (top of screen)
+            y = maze_height + SCORE_HEIGHT - self.rect.height
+        elif self.rect.top > maze_height + SCORE_HEIGHT:  # Gone off bottom edge
+            y = SCORE_HEIGHT
+
+        # Teleport without interpolating across the screen
+        if x != self.x or y != self.y:
+            self.place(x, y)
+
+
+class Pacman(Actor):
+    """Pacman sprite - player controlled character"""
+
+    def __init__(self, x, y, atlas):
+        super().__init__()
+        self.atlas = atlas
+        self.size = atlas.pacman_size
+        self.image = atlas.pacman_image(True, 0, 0)
+        self.rect = self.image.get_rect()
+        # Centre in the tile (5px margin at the default tile size)
+        self.margin = (atlas.cell_size - self.size) // 2
+        self.place(x + self.margin, y + self.margin + SCORE_HEIGHT)
+        self.start_x = x + self.margin
+        self.start_y = y + self.margin
+        scale = atlas.cell_size / CELL_SIZE
+        self.speed = PACMAN_SPEED * scale
+        self.corner_tolerance = round(CORNER_TOLERANCE * scale)
+        self.dx = 0
+        self.dy = 0
+        self.next_dx = 0
+        self.next_dy = 0
+        self.mouth_open = True
+        self.mouth_timer = 0
+
+    def update(self, maze, dt=0):
+        """Update Pacman position with collision detection"""
+        self.start_tick()
+
+        # Update mouth animation
+        self.mouth_timer += dt
+        if self.mouth_timer >= 0.1:
+            self.mouth_timer = 0
+            self.mouth_open = not self.mouth_open
+            # Swap to the pre-rendered frame for the current direction
+            # (all frames are the same size, so the rect stays as it is)
+            self.image = self.atlas.pacman_image(self.mouth_open, self.dx, self.dy)
+
+        # Try to change direction if a new direction was requested
+        self.try_turn(maze)
+
+        # Move in current direction (frame-rate independent), taking the
+        # requested turn at the first tile centre where it is open
+        remaining = self.speed * dt
+        while remaining > 0 and (self.dx != 0 or self.dy != 0):
+            moved, blocked = self.advance(maze, remaining)
+            remaining -= moved
+            if blocked:
+                # Stop if hit a wall
+                self.dx = 0
+                self.dy = 0
+            self.try_turn(maze)
+
+        self.wrap_around(maze)
+
+    def try_turn(self, maze):
+        """Take the requested direction if it is open from where Pacman is"""
+        next_dx = self.next_dx
+        next_dy = self.next_dy
+        if next_dx == 0 and next_dy == 0:
+            return
+
+        if (next_dx != 0 and self.dx != 0) or (next_dy != 0 and self.dy != 0):
+            # Reversing needs no lining up, only room to move
+            position = self.x if next_dx != 0 else self.y
+            if maze.free_distance(self.rect, position, next_dx, next_dy, 1) == 0:
+                return
+        else:
+            # Turning a corner (or starting to move): line up with the
+            # nearest tile centre first, if it is close enough
+            vertical = next_dx != 0  # The axis Pacman lines up on
+            lane = self.nearest_lane(maze.cell_size, vertical)
+            if vertical:
+                if abs(self.y - lane) > self.corner_tolerance:
+                    return
+                x, y = self.x, lane
+            else:
+                if abs(self.x - lane) > self.corner_tolerance:
+                    return
+                x, y = lane, self.y
+            col, row = maze.tile_at(x + self.size // 2, y + self.size // 2)
+            if maze.is_wall(col + next_dx, row + next_dy):
+                return
+            self.move_to(x, y)
+
+        self.dx = next_dx
+        self.dy = next_dy
+        self.next_dx = 0
+        self.next_dy = 0
+
+    def set_direction(self, dx, dy):
+        """Set the next direction to move"""
+        self.next_dx = dx
+        self.next_dy = dy
+
+    def reset(self):
+        """Reset Pacman to starting position"""
+        self.place(self.start_x, self.start_y + SCORE_HEIGHT)
+        self.dx = 0
+        self.dy = 0
+        self.next_dx = 0
+        self.next_dy = 0
+        self.mouth_open = True
+        self.mouth_timer = 0
+
+
+class Ghost(Actor):
+    """Ghost sprite - enemy that chases Pacman"""
+
+    # Up, down, left, right - the order directions are scored in
+    DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+
+    def __init__(self, x, y, color, atlas, rng=random):
+        super().__init__()
+        self.atlas = atlas
+        self.rng = rng  # Each game passes its own seeded generator
+        self.size = atlas.ghost_size
+        self.color = color
+        self.original_color = color
+        self.vulnerable_colors = VULNERABLE_COLORS
+        self.color_index = 0
+        self.color_timer = 0
+        # Add random speed variation (up to 5%)
+        speed_multiplier = 1.0 + self.rng.uniform(0, GHOST_SPEED_VARIATION)
+        scale = atlas.cell_size / CELL_SIZE
+        self.speed = GHOST_SPEED * speed_multiplier * scale
+        # Wall probes used to pick a direction and to get unstuck
+        # (4px and 6px at the default tile size)
+        self.turn_lookahead = max(1, round(4 * scale))
+        self.unstuck_lookahead = max(1, round(6 * scale))
+        self.image = atlas.ghost_image(color)
+        self.rect = self.image.get_rect()
+        # Centre in the tile (2px margin at the default tile size)
+        self.margin = (atlas.cell_size - self.size) // 2
+        self.place(x + self.margin, y + self.margin + SCORE_HEIGHT)
+        self.start_x = x + self.margin
+        self.start_y = y + self.margin
+        self.dx = self.rng.choice([-1, 1])
+        self.dy = 0
+
+    def update(self, maze, pacman, vulnerable=False, dt=0):
         """Update ghost position with AI - chase when normal, flee when vulnerable"""
+        self.start_tick()
+
         # Update color cycling if vulnerable
         if vulnerable:
             self.color_timer += dt
@@ -363,47 +684,60 @@ class Ghost(pygame.sprite.Sprite):
                 self.color_timer = 0
                 self.color_index = (self.color_index + 1) % len(self.vulnerable_colors)
                 self.color = self.vulnerable_colors[self.color_index]
-                self.image = self.create_ghost_image(self.color)
+                self.image = self.atlas.ghost_image(self.color)
         else:
             # Reset to original color when not vulnerable
             if self.color != self.original_color:
                 self.color = self.original_color
-                self.image = self.create_ghost_image(self.original_color)
+                self.image = self.atlas.ghost_image(self.original_color)
                 self.color_timer = 0
                 self.color_index = 0
 
-        # Determine desired direction based on vulnerable state
-        # All possible directions: up, down, left, right
-        directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]  # Up  # Down  # Left  # Right
+        # Maze distances to Pacman (shared by all ghosts, recomputed per tile)
+        distances = maze.distances_from(maze.tile_at(*pacman.rect.center))
+
+        # Move in the chosen direction (frame-rate independent), choosing
+        # again at every tile centre passed on the way
+        remaining = self.speed * dt
+        while True:
+            self.choose_direction(maze, distances, vulnerable)
+            moved, blocked = self.advance(maze, remaining)
+            remaining -= moved
+            if blocked:
+                # Hit a wall, turn to any open direction to get away from it
+                self.unstick(maze)
+                break
+            if remaining <= 0:
+                break
+
+        # Ghosts can also use the tunnels
+        self.wrap_around(maze)
+
+    def choose_direction(self, maze, distances, vulnerable):
+        """Turn towards Pacman (away from him when vulnerable) if that is open"""
+        # Probe just over half a tile ahead, i.e. the tile we are heading into
+        probe_distance = maze.cell_size // 2 + 1
 
         # Score each direction based on whether we want to chase or flee
         best_direction = None
         best_score = None
 
-        for dx, dy in directions:
-            # Test if we can move in this direction (use fixed lookahead distance)
+        for dx, dy in self.DIRECTIONS:
+            # Test if we can move in this direction (small lookahead for turns)
             test_rect = self.rect.copy()
-            lookahead_distance = 4  # pixels
-            test_rect.x = self.rect.x + dx * lookahead_distance
-            test_rect.y = self.rect.y + dy * lookahead_distance
+            test_rect.x = self.rect.x + dx * self.turn_lookahead
+            test_rect.y = self.rect.y + dy * self.turn_lookahead
 
             # Check for wall collision
-            collision = False
-            for wall in walls:
-                if test_rect.colliderect(wall.rect):
-                    collision = True
-                    break
-
-            if not collision:
-                # Calculate what the distance to Pacman would be if we move this way
-                # Use fixed lookahead for AI decisions
-                future_lookahead = 15  # pixels
-                future_x = self.rect.centerx + dx * future_lookahead
-                future_y = self.rect.centery + dy * future_lookahead
-                distance_after_move = (
-                    (future_x - pacman.rect.centerx) ** 2
-                    + (future_y - pacman.rect.centery) ** 2
-                ) ** 0.5
+            if not maze.collides(test_rect):
+                # Maze distance to Pacman from the tile in this direction
+                col, row = maze.tile_at(
+                    self.rect.centerx + dx * probe_distance,
+                    self.rect.centery + dy * probe_distance,
+                )
+                distance_after_move = maze.distance(distances, col, row)
+                if distance_after_move == UNREACHABLE:
+                    continue
 
                 if vulnerable:
                     # When vulnerable, prefer directions that increase distance (flee)
@@ -412,9 +746,9 @@ class Ghost(pygame.sprite.Sprite):
                     # When not vulnerable, prefer directions that decrease distance (chase)
                     score = -distance_after_move
 
-                # Prefer to keep moving in current direction (add small bonus)
+                # Prefer to keep moving in current direction (breaks ties)
                 if dx == self.dx and dy == self.dy:
-                    score += 5
+                    score += 0.5
 
                 if best_score is None or score > best_score:
                     best_score = score
@@ -424,179 +758,301 @@ class Ghost(pygame.sprite.Sprite):
         if best_direction:
             self.dx, self.dy = best_direction
 
-        # Move in current direction (frame-rate independent)
-        new_x = self.rect.x + self.dx * self.speed * dt
-        new_y = self.rect.y + self.dy * self.speed * dt
-
-        test_rect = self.rect.copy()
-        test_rect.x = new_x
-        test_rect.y = new_y
+    def unstick(self, maze):
+        """After running into a wall, turn to a random open direction"""
+        # Try to find any valid direction (slightly larger lookahead)
+        directions = list(self.DIRECTIONS)
+        self.rng.shuffle(directions)
+        for dx, dy in directions:
+            test_rect = self.rect.copy()
+            test_rect.x = self.rect.x + dx * self.unstuck_lookahead
+            test_rect.y = self.rect.y + dy * self.unstuck_lookahead
 
-        # Check collision
-        collision = False
-        for wall in walls:
-            if test_rect.colliderect(wall.rect):
-                collision = True
+            if not maze.collides(test_rect):
+                self.dx = dx
+                self.dy = dy
                 break
 
-        if not collision:
-            self.rect.x = new_x
-            self.rect.y = new_y
-        else:
-            # Hit a wall, force recalculation on next update
-            # Try to find any valid direction (use fixed lookahead)
-            random.shuffle(directions)
-            for dx, dy in directions:
-                test_rect = self.rect.copy()
-                lookahead_distance = 6  # pixels
-                test_rect.x = self.rect.x + dx * lookahead_distance
-                test_rect.y = self.rect.y + dy * lookahead_distance
-
-                collision = False
-                for wall in walls:
-                    if test_rect.colliderect(wall.rect):
-                        collision = True
-                        break
-
-                if not collision:
-                    self.dx = dx
-                    self.dy = dy
-                    break
-
-        # Check for wraparound at maze edges (ghosts can also use tunnels)
-        # The playable maze is from y=SCORE_HEIGHT to y=SCORE_HEIGHT+maze_height
-        maze_width = GRID_WIDTH * CELL_SIZE
-        maze_height = GRID_HEIGHT * CELL_SIZE
-
-        # Horizontal wraparound
-        if self.rect.right < 0:  # Gone off left edge
-            self.rect.x = maze_width
-        elif self.rect.left > maze_width:  # Gone off right edge
-            self.rect.x = -self.rect.width
-
-        # Vertical wraparound (score area is NOT part of the playable maze)
-        if self.rect.top < SCORE_HEIGHT:  # Gone into/above score area (top of screen)
-            self.rect.y = maze_height + SCORE_HEIGHT - self.rect.height
-        elif self.rect.top > maze_height + SCORE_HEIGHT:  # Gone off bottom edge
-            self.rect.y = SCORE_HEIGHT
-
     def reset(self):
         """Reset ghost to starting position"""
-        self.rect.x = self.start_x
-        self.rect.y = self.start_y + SCORE_HEIGHT
-        self.dx = random.choice([-1, 1])
+        self.place(self.start_x, self.start_y + SCORE_HEIGHT)
+        self.dx = self.rng.choice([-1, 1])
         self.dy = 0
-        self.image = self.create_ghost_image(self.original_color)
+        self.image = self.atlas.ghost_image(self.original_color)
         self.color = self.original_color
         self.color_timer = 0
         self.color_index = 0
 
 
+class InputLog:
+    """Player actions with the tick they were applied on, plus the game's seed and maze.
+
+    With the fixed time step this is all it takes to replay a session exactly
+    (see replay.py). Saved as a small JSON file.
+    """
+
+    VERSION = 3
+
+    def __init__(
+        self,
+        seed,
+        layout,
+        dt=SIMULATION_DT,
+        events=None,
+        end_tick=0,
+        swarm=False,
+        separate_ghosts=False,
+    ):
+        self.seed = seed
+        self.layout = layout
+        self.swarm = swarm  # Whether the ghosts were moved by a GhostSwarm
+        self.separate_ghosts = separate_ghosts  # Whether ghosts pushed each other
+        self.dt = dt
+        self.events = events if events is not None else []  # [tick, action] pairs
+        self.end_tick = end_tick
+
+    def record(self, tick, action):
+        """Add an action applied before the given tick"""
+        self.events.append([tick, action])
+
+    def actions_by_tick(self):
+        """Group the actions by tick, keeping their order"""
+        actions = {}
+        for tick, action in self.events:
+            actions.setdefault(tick, []).append(action)
+        return actions
+
+    def save(self, path):
+        """Write the log to a JSON file"""
+        data = {
+            "version": self.VERSION,
+            "seed": self.seed,
+            "layout": self.layout,
+            "swarm": self.swarm,
+            "separate_ghosts": self.separate_ghosts,
+            "dt": self.dt,
+            "end_tick": self.end_tick,
+            "events": self.events,
+        }
+        with open(path, "w") as log_file:
+            json.dump(data, log_file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path):
+        """Read a log written by save()"""
+        with open(path) as log_file:
+            data = json.load(log_file)
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported input log version: {data.get('version')}")
+        return cls(
+            data["seed"],
+            data["layout"],
+            data["dt"],
+            data["events"],
+            data["end_tick"],
+            data.get("swarm", False),
+            data.get("separate_ghosts", False),
+        )
+
+
 class Game:
     """Main game class"""
 
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Pac-Man")
+    def __init__(
+        self,
+        headless=False,
+        seed=None,
+        audio=True,
+        record=False,
+        layout=None,
+        audio_cache=None,
+        swarm=False,
+        separate_ghosts=False,
+        render_target=None,
+        tracer=None,
+    ):
+        # A headless game has no window, no audio and no frame limiter
+        self.headless = headless
+        # A headless game can still draw into a surface of the window's size
+        # (see screen_size_for() and observations.py)
+        self.renders = not headless or render_target is not None
+        self.audio = audio and not headless
+        # All game randomness comes from this generator, so a seed replays a game
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.tick = 0  # Simulation ticks since the game was created
+        # Maze layout (see mazes.py), the built-in MAZE by default
+        self.layout = layout if layout is not None else parse_layout(MAZE)
+        # Move all ghosts in one vectorised step (needs NumPy, see swarm.py)
+        self.use_swarm = swarm
+        self.swarm = None
+        # Push overlapping ghosts apart (for levels crowded with ghosts)
+        self.separate_ghosts = separate_ghosts
+        # Log of player actions (only kept when recording)
+        self.input_log = None
+        if record:
+            self.input_log = InputLog(
+                seed, self.layout, swarm=swarm, separate_ghosts=separate_ghosts
+            )
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
-        self.large_font = pygame.font.Font(None, 72)
+        # Timeline of the session (see common/tracer.py), None when not tracing
+        self.tracer = tracer
+        self.profiler = FrameProfiler(tracer=tracer)
         self.score = 0
         self.running = True
         self.power_up_timer = 0
         self.is_powered_up = False
         self.game_state = STATE_PLAYING
 
-        # Sprite groups
-        self.all_sprites = pygame.sprite.Group()
-        self.walls = pygame.sprite.Group()
-        self.pellets = pygame.sprite.Group()
-        self.power_pellets = pygame.sprite.Group()
+        # Sprite groups (only the moving actors are drawn every frame)
+        self.actors = pygame.sprite.RenderUpdates()
         self.ghosts = pygame.sprite.Group()
 
-        # Load sounds
-        self.load_sounds()
-
+        # Build the maze and actors (this also pre-renders all sprite frames)
+        self.atlas = None
+        self.eaten_pellets = []  # (col, row, kind) still to erase from the screen
         self.setup_maze()
 
+        # The window fits the maze, with the score bar on top
+        self.screen_width = self.maze.pixel_width
+        self.screen_height = self.maze.pixel_height + SCORE_HEIGHT
+        if self.renders:
+            pygame.font.init()
+            if headless:
+                self.screen = render_target
+            else:
+                pygame.display.init()
+                self.screen = pygame.display.set_mode(
+                    (self.screen_width, self.screen_height)
+                )
+                pygame.display.set_caption("Pac-Man")
+            self.font = pygame.font.Font(None, 36)
+            self.large_font = pygame.font.Font(None, 72)
+
+            # Rendered text is cached, static labels are rendered once up front
+            self.text_cache = TextCache()
+            pin = self.text_cache.pin
+            self.game_over_text = pin(self.large_font, "GAME OVER!", RED)
+            self.win_text = pin(self.large_font, "YOU WIN!", GREEN)
+            self.restart_text = pin(self.font, "Press R to Restart", WHITE)
+            self.quit_text = pin(self.font, "Press ESC to Quit", WHITE)
+
+        # Rendering state: walls and pellets are baked into a background
+        # surface, and only the regions that changed are pushed to the display
+        screen_size = (self.screen_width, self.screen_height)
+        self.hud_rect = pygame.Rect(0, 0, self.screen_width, SCORE_HEIGHT)
+        self.hud_texts = None
+        self.needs_full_redraw = True
+        self.drawn_state = None
+        if self.renders:
+            self.background = pygame.Surface(screen_size)
+            self.overlay = pygame.Surface(screen_size)
+            self.overlay.set_alpha(180)
+            self.overlay.fill(BLACK)
+            self.build_background()
+
+        # Sounds load in the background while the first frames are drawn
+        # (audio_cache is a folder for decoded sounds, see audio.py)
+        self.sounds = None
+        if self.audio:
+            self.sounds = SoundBank(SOUNDS_DIR, audio_cache)
+            self.sounds.start()
+
         # Start background music
         self.play_background_music()
 
-    def load_sounds(self):
-        """Load all sound effects and music"""
-        # Get the directory where this script is located
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        sounds_dir = os.path.join(script_dir, "sounds")
-
-        try:
-            # Load background music
-            music_path = os.path.join(sounds_dir, "music.mp3")
-            pygame.mixer.music.load(music_path)
-
-            # Load sound effects
-            eat_pill_path = os.path.join(sounds_dir, "eatpill.mp3")
-            dead_path = os.path.join(sounds_dir, "dead.mp3")
-
-            self.eat_pill_sound = pygame.mixer.Sound(eat_pill_path)
-            self.dead_sound = pygame.mixer.Sound(dead_path)
-
-            # Set volume levels
-            self.eat_pill_sound.set_volume(0.5)
-            self.dead_sound.set_volume(0.7)
-            pygame.mixer.music.set_volume(0.3)
-
-        except Exception as e:
-            print(f"Warning: Could not load sounds: {e}")
-            # Create dummy sound objects that do nothing
-            self.eat_pill_sound = None
-            self.dead_sound = None
-
     def play_background_music(self):
         """Start playing background music in a loop"""
-        try:
-            pygame.mixer.music.play(-1)  # -1 means loop indefinitely
-        except Exception as e:
-            print(f"Warning: Could not play background music: {e}")
+        if self.sounds is not None:
+            self.sounds.play_music()
 
     def stop_background_music(self):
         """Stop the background music"""
-        try:
-            pygame.mixer.music.stop()
-        except Exception:
-            pass
+        if self.sounds is not None:
+            self.sounds.stop_music()
+
+    def play_sound(self, name):
+        """Play a sound effect (skipped while sounds are still loading)"""
+        if self.sounds is not None:
+            self.sounds.play(name)
+
+    def mark(self, name, **args):
+        """Add a game event marker to the trace (if tracing)"""
+        if self.tracer is not None:
+            self.tracer.marker(name, **args)
 
     def setup_maze(self):
-        """Parse the maze string and create sprite objects"""
-        lines = [line for line in MAZE.split("\n") if line.strip()]
+        """Build the maze from the layout and create the actors"""
+        self.maze = Maze(self.layout)
+        cell_size = self.maze.cell_size
+
+        # Pre-render all sprite frames once (again only if the tile size changes)
+        if self.atlas is None or self.atlas.cell_size != cell_size:
+            self.atlas = SpriteAtlas(cell_size)
 
-        ghost_colors = [RED, PINK, CYAN, ORANGE]
         ghost_index = 0
 
-        for row, line in enumerate(lines):
+        for row, line in enumerate(self.layout):
             for col, char in enumerate(line):
-                x = col * CELL_SIZE
-                y = row * CELL_SIZE
-
-                if char == "X":
-                    wall = Wall(x, y)
-                    self.walls.add(wall)
-                    self.all_sprites.add(wall)
-                elif char == ".":
-                    pellet = Pellet(x, y)
-                    self.pellets.add(pellet)
-                    self.all_sprites.add(pellet)
-                elif char == "S":
-                    self.pacman = Pacman(x, y)
-                    self.all_sprites.add(self.pacman)
+                x = col * cell_size
+                y = row * cell_size
+
+                if char == "S":
+                    self.pacman = Pacman(x, y, self.atlas)
+                    self.actors.add(self.pacman)
                 elif char == "G":
-                    ghost = Ghost(x, y, ghost_colors[ghost_index % len(ghost_colors)])
+                    color = GHOST_COLORS[ghost_index % len(GHOST_COLORS)]
+                    ghost = Ghost(x, y, color, self.atlas, self.rng)
                     ghost_index += 1
                     self.ghosts.add(ghost)
-                    self.all_sprites.add(ghost)
-                elif char == "P":
-                    power_pellet = PowerPellet(x, y)
-                    self.power_pellets.add(power_pellet)
-                    self.all_sprites.add(power_pellet)
+                    self.actors.add(ghost)
+
+        # Ghosts bucketed by tile, rebuilt every tick for collision tests
+        self.ghost_hash = SpatialHash(self.maze)
+        if self.use_swarm:
+            # Imported here so games without a swarm never load NumPy
+            from swarm import GhostSwarm
+
+            self.swarm = GhostSwarm(
+                self.ghosts, self.maze, SCORE_HEIGHT, self.rng.getrandbits(64)
+            )
+
+        self.eaten_pellets = []
+
+    def build_background(self):
+        """Bake the walls and pellets into the static background surface"""
+        cell_size = self.maze.cell_size
+        self.background.fill(BLACK)
+        for row in range(self.maze.height):
+            for col in range(self.maze.width):
+                if self.maze.is_wall(col, row):
+                    wall_rect = (
+                        col * cell_size,
+                        row * cell_size + SCORE_HEIGHT,
+                        cell_size,
+                        cell_size,
+                    )
+                    self.background.fill(BLUE, wall_rect)
+                else:
+                    kind = self.maze.pellet_at(col, row)
+                    if kind != NO_PELLET:
+                        pellet_rect = self.pellet_rect(col, row, kind)
+                        self.background.fill(PELLET_COLORS[kind], pellet_rect)
+
+        self.needs_full_redraw = True
+
+    def pellet_rect(self, col, row, kind):
+        """Get the screen rect of a pellet, centred in its tile"""
+        cell_size = self.maze.cell_size
+        size = max(1, PELLET_SIZES[kind] * cell_size // CELL_SIZE)
+        rect = pygame.Rect(0, 0, size, size)
+        rect.center = (
+            col * cell_size + cell_size // 2,
+            row * cell_size + cell_size // 2 + SCORE_HEIGHT,
+        )
+        return rect
 
     def reset(self):
         """Reset the game to initial state"""
@@ -606,14 +1062,13 @@ class Game:
         self.game_state = STATE_PLAYING
 
         # Clear all sprite groups
-        self.all_sprites.empty()
-        self.walls.empty()
-        self.pellets.empty()
-        self.power_pellets.empty()
+        self.actors.empty()
         self.ghosts.empty()
 
         # Recreate the maze
         self.setup_maze()
+        if self.renders:
+            self.build_background()
 
         # Restart background music
         self.play_background_music()
@@ -639,43 +1094,96 @@ class Game:
         # Collision occurs if distance is less than sum of radii
         return distance < (radius1 + radius2)
 
-    def handle_events(self):
-        """Handle keyboard input"""
-        for event in pygame.event.get():
+    def separate_overlapping_ghosts(self):
+        """
+        Push overlapping ghosts apart along the axis they are furthest apart on.
+        Only ghosts on the same or neighbouring tiles are compared.
+        Returns True if any ghost moved.
+        """
+        moved = []
+        for ghost, other in self.ghost_hash.pairs():
+            if not self.check_circular_collision(ghost, other):
+                continue
+            gap_x = other.rect.centerx - ghost.rect.centerx
+            gap_y = other.rect.centery - ghost.rect.centery
+            if gap_x == 0 and gap_y == 0:
+                continue  # Same spot, nothing says which way to push
+
+            # Each ghost backs off by half the overlap (if there is no wall)
+            radii = (ghost.rect.width + other.rect.width) / 2
+            push = (radii - math.hypot(gap_x, gap_y)) / 2
+            if abs(gap_x) >= abs(gap_y):
+                push_x, push_y = math.copysign(push, gap_x), 0
+            else:
+                push_x, push_y = 0, math.copysign(push, gap_y)
+            for actor, direction in ((ghost, -1), (other, 1)):
+                new_x = actor.x + direction * push_x
+                new_y = actor.y + direction * push_y
+                test_rect = actor.rect.copy()
+                test_rect.x = new_x
+                test_rect.y = new_y
+                if not self.maze.collides(test_rect):
+                    actor.move_to(new_x, new_y)
+                    moved.append(actor)
+
+        if moved and self.swarm is not None:
+            self.swarm.pull_positions(moved)
+        return bool(moved)
+
+    def handle_events(self, events=None):
+        """Handle keyboard input (all queued events unless events are given)"""
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.WINDOWEXPOSED:
+                # The window was covered up, redraw it all
+                self.needs_full_redraw = True
+            elif event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+                self.profiler.toggle()
+                # Redraw it all to make room for the overlay or wipe it away
+                self.needs_full_redraw = True
             elif event.type == pygame.KEYDOWN:
                 if self.game_state == STATE_PLAYING:
                     if event.key == pygame.K_ESCAPE:
                         self.running = False
                     elif event.key == pygame.K_r:
-                        self.reset()
+                        self.apply_action(ACTION_RESTART)
                     elif event.key == pygame.K_UP:
-                        self.pacman.set_direction(0, -1)
+                        self.apply_action("up")
                     elif event.key == pygame.K_DOWN:
-                        self.pacman.set_direction(0, 1)
+                        self.apply_action("down")
                     elif event.key == pygame.K_LEFT:
-                        self.pacman.set_direction(-1, 0)
+                        self.apply_action("left")
                     elif event.key == pygame.K_RIGHT:
-                        self.pacman.set_direction(1, 0)
+                        self.apply_action("right")
                 elif self.game_state in (STATE_GAME_OVER, STATE_WON):
                     # In game over or won state
                     if event.key == pygame.K_r:
-                        self.reset()
+                        self.apply_action(ACTION_RESTART)
                     elif event.key == pygame.K_ESCAPE:
                         self.running = False
 
-    def update(self):
-        """Update all game objects"""
+    def apply_action(self, action):
+        """Apply a player action (a direction or restart), logging it if recording"""
+        if self.input_log is not None:
+            self.input_log.record(self.tick, action)
+
+        if action == ACTION_RESTART:
+            self.mark("restart")
+            self.reset()
+        else:
+            self.pacman.set_direction(*ACTION_DIRECTIONS[action])
+
+    def update(self, dt=SIMULATION_DT):
+        """Advance all game objects by one simulation tick of dt seconds"""
+        self.tick += 1
+
         # Only update if playing
         if self.game_state != STATE_PLAYING:
             return
 
-        # Get time delta (frame-rate independent)
-        dt = self.clock.get_time() / 1000.0  # Convert to seconds
-        # Clamp dt to prevent physics issues during lag spikes
-        dt = min(dt, 0.05)  # Max 50ms (20 FPS minimum)
-
         # Update power-up timer
         if self.is_powered_up:
             self.power_up_timer -= dt
@@ -683,39 +1191,50 @@ class Game:
                 self.is_powered_up = False
                 self.power_up_timer = 0
 
-        # Update Pacman
-        self.pacman.update(self.walls, dt)
+        tracer = self.tracer
+        if tracer is not None:
+            start = tracer.now()
 
-        # Update ghosts
-        for ghost in self.ghosts:
-            ghost.update(self.walls, self.pacman, self.is_powered_up, dt)
+        # Update Pacman
+        self.pacman.update(self.maze, dt)
+        if tracer is not None:
+            start = tracer.span("pacman", start)
 
-        # Check collision with pellets
-        pellet_hits = pygame.sprite.spritecollide(self.pacman, self.pellets, True)
-        for pellet in pellet_hits:
-            self.score += pellet.points
-            self.all_sprites.remove(pellet)
+        # Update ghosts (all at once in swarm mode)
+        if self.swarm is not None:
+            self.swarm.update(self.pacman, self.is_powered_up, dt)
+        else:
+            for ghost in self.ghosts:
+                ghost.update(self.maze, self.pacman, self.is_powered_up, dt)
+        if tracer is not None:
+            start = tracer.span("ghost AI", start)
+
+        # Eat the pellet (if any) on the tile under Pacman's centre
+        col, row = self.maze.tile_at(*self.pacman.rect.center)
+        kind = self.maze.eat_pellet(col, row)
+        if kind != NO_PELLET:
+            self.score += PELLET_POINTS[kind]
+            self.eaten_pellets.append((col, row, kind))
+            self.mark("pellet eaten", kind=kind, tile=[col, row])
             # Play eat pill sound
-            if self.eat_pill_sound:
-                self.eat_pill_sound.play()
+            self.play_sound("eatpill")
+            if kind == POWER_PELLET:
+                # Activate power-up
+                self.is_powered_up = True
+                self.power_up_timer = POWER_UP_DURATION
 
-        # Check collision with power pellets
-        power_pellet_hits = pygame.sprite.spritecollide(
-            self.pacman, self.power_pellets, True
-        )
-        for pellet in power_pellet_hits:
-            self.score += pellet.points
-            self.all_sprites.remove(pellet)
-            # Play eat pill sound
-            if self.eat_pill_sound:
-                self.eat_pill_sound.play()
-            # Activate power-up
-            self.is_powered_up = True
-            self.power_up_timer = POWER_UP_DURATION
+        # Bucket the ghosts by tile, so collision tests only look nearby
+        self.ghost_hash.rebuild(self.ghosts)
+        if self.separate_ghosts and self.separate_overlapping_ghosts():
+            self.ghost_hash.rebuild(self.ghosts)
 
         # Check collision with ghosts (two-step collision detection)
-        # Step 1: Fast bounding box collision
-        ghost_hits = pygame.sprite.spritecollide(self.pacman, self.ghosts, False)
+        # Step 1: Fast bounding box collision with the ghosts near Pacman
+        ghost_hits = [
+            ghost
+            for ghost in self.ghost_hash.near(self.pacman)
+            if self.pacman.rect.colliderect(ghost.rect)
+        ]
 
         # Step 2: Accurate circular collision detection for potential hits
         actual_collisions = []
@@ -728,122 +1247,377 @@ class Game:
                 # Eat the ghosts
                 for ghost in actual_collisions:
                     self.score += 200  # Bonus points for eating ghost
+                    self.mark("ghost eaten")
                     self.ghosts.remove(ghost)
-                    self.all_sprites.remove(ghost)
+                    self.actors.remove(ghost)
+                    if self.swarm is not None:
+                        self.swarm.remove(ghost)
             else:
                 # Die
                 self.game_state = STATE_GAME_OVER
+                self.mark("life lost", score=self.score)
                 # Stop background music and play death sound
                 self.stop_background_music()
-                if self.dead_sound:
-                    self.dead_sound.play()
+                self.play_sound("dead")
+
+        if tracer is not None:
+            tracer.span("collisions", start)
 
         # Check win condition
-        if len(self.pellets) == 0 and len(self.power_pellets) == 0:
+        if self.maze.pellets_left == 0:
             self.game_state = STATE_WON
+            self.mark("won", score=self.score)
             # Stop background music
             self.stop_background_music()
 
-    def draw(self):
-        """Draw all game objects"""
-        self.screen.fill(BLACK)
-
-        # Draw score
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (10, 5))
-
-        # Draw power-up timer if active
-        if self.is_powered_up and self.game_state == STATE_PLAYING:
-            timer_text = self.font.render(
-                f"POWER UP: {self.power_up_timer:.1f}s", True, YELLOW
-            )
-            self.screen.blit(timer_text, (SCREEN_WIDTH - 250, 5))
+    def draw(self, alpha=1.0):
+        """Draw a frame and push it to the display"""
+        self.present(self.render(alpha))
 
-        # Draw all sprites
-        self.all_sprites.draw(self.screen)
+    def render(self, alpha=1.0):
+        """
+        Draw all game objects to the screen surface, returns the regions that
+        changed (None after a full redraw). alpha (0-1) is how far we are
+        between the last two simulation ticks, actors are drawn at that point
+        between their two positions.
+        """
+        # Game over and win screens are drawn in full once, then left alone
+        if self.needs_full_redraw or self.game_state != self.drawn_state:
+            self.draw_full(alpha)
+            return None
+        if self.game_state != STATE_PLAYING:
+            return []
+
+        dirty_rects = []
+
+        # Erase eaten pellets from the background and the screen
+        for col, row, kind in self.eaten_pellets:
+            rect = self.pellet_rect(col, row, kind)
+            self.background.fill(BLACK, rect)
+            self.screen.blit(self.background, rect, rect)
+            dirty_rects.append(rect)
+        self.eaten_pellets = []
+
+        # Redraw the score bar only when its text changed
+        if self.draw_hud():
+            dirty_rects.append(self.hud_rect)
+
+        # Restore the background under the actors and draw them at their new spots
+        self.actors.clear(self.screen, self.background)
+        self.draw_actors(alpha, dirty_rects)
+        return dirty_rects
+
+    def present(self, dirty_rects):
+        """Push a rendered frame to the display, all of it if dirty_rects is None"""
+        if self.headless:
+            return
+        if dirty_rects is None:
+            pygame.display.flip()
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
+
+    def draw_actors(self, alpha, dirty_rects=None):
+        """Draw the actors at their interpolated positions"""
+        for actor in self.actors:
+            actor.interpolate(alpha)
+        drawn_rects = self.actors.draw(self.screen)
+        # Put the rects back where the simulation has them
+        for actor in self.actors:
+            actor.interpolate(1.0)
+
+        if dirty_rects is not None:
+            dirty_rects.extend(drawn_rects)
+
+    def draw_full(self, alpha=1.0):
+        """Redraw the whole screen from the background"""
+        for col, row, kind in self.eaten_pellets:
+            self.background.fill(BLACK, self.pellet_rect(col, row, kind))
+        self.eaten_pellets = []
+
+        self.screen.blit(self.background, (0, 0))
+        self.hud_texts = None
+        self.draw_hud()
+        self.draw_actors(alpha)
 
         # Draw game over or win message
         if self.game_state == STATE_GAME_OVER:
             # Semi-transparent overlay
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(180)
-            overlay.fill(BLACK)
-            self.screen.blit(overlay, (0, 0))
+            self.screen.blit(self.overlay, (0, 0))
 
             # Game over text
-            game_over_text = self.large_font.render("GAME OVER!", True, RED)
-            game_over_rect = game_over_text.get_rect(
-                center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50)
+            game_over_rect = self.game_over_text.get_rect(
+                center=(self.screen_width // 2, self.screen_height // 2 - 50)
             )
-            self.screen.blit(game_over_text, game_over_rect)
+            self.screen.blit(self.game_over_text, game_over_rect)
 
             # Instructions
-            restart_text = self.font.render("Press R to Restart", True, WHITE)
-            restart_rect = restart_text.get_rect(
-                center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20)
+            restart_rect = self.restart_text.get_rect(
+                center=(self.screen_width // 2, self.screen_height // 2 + 20)
             )
-            self.screen.blit(restart_text, restart_rect)
+            self.screen.blit(self.restart_text, restart_rect)
 
-            quit_text = self.font.render("Press ESC to Quit", True, WHITE)
-            quit_rect = quit_text.get_rect(
-                center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60)
+            quit_rect = self.quit_text.get_rect(
+                center=(self.screen_width // 2, self.screen_height // 2 + 60)
             )
-            self.screen.blit(quit_text, quit_rect)
+            self.screen.blit(self.quit_text, quit_rect)
 
         elif self.game_state == STATE_WON:
             # Semi-transparent overlay
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(180)
-            overlay.fill(BLACK)
-            self.screen.blit(overlay, (0, 0))
+            self.screen.blit(self.overlay, (0, 0))
 
             # Win text
-            win_text = self.large_font.render("YOU WIN!", True, GREEN)
-            win_rect = win_text.get_rect(
-                center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50)
+            win_rect = self.win_text.get_rect(
+                center=(self.screen_width // 2, self.screen_height // 2 - 50)
             )
-            self.screen.blit(win_text, win_rect)
+            self.screen.blit(self.win_text, win_rect)
 
             # Final score
-            final_score_text = self.font.render(
-                f"Final Score: {self.score}", True, YELLOW
+            final_score_text = self.text_cache.render(
+                self.font, f"Final Score: {self.score}", YELLOW
             )
             final_score_rect = final_score_text.get_rect(
-                center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+                center=(self.screen_width // 2, self.screen_height // 2)
             )
             self.screen.blit(final_score_text, final_score_rect)
 
             # Instructions
-            restart_text = self.font.render("Press R to Restart", True, WHITE)
-            restart_rect = restart_text.get_rect(
-                center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)
+            restart_rect = self.restart_text.get_rect(
+                center=(self.screen_width // 2, self.screen_height // 2 + 50)
             )
-            self.screen.blit(restart_text, restart_rect)
+            self.screen.blit(self.restart_text, restart_rect)
 
-            quit_text = self.font.render("Press ESC to Quit", True, WHITE)
-            quit_rect = quit_text.get_rect(
-                center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 90)
+            quit_rect = self.quit_text.get_rect(
+                center=(self.screen_width // 2, self.screen_height // 2 + 90)
             )
-            self.screen.blit(quit_text, quit_rect)
+            self.screen.blit(self.quit_text, quit_rect)
 
-        pygame.display.flip()
+        self.drawn_state = self.game_state
+        self.needs_full_redraw = False
+
+    def draw_hud(self):
+        """Draw the score bar if its text changed, returns True if it was redrawn"""
+        power_up = None
+        if self.is_powered_up and self.game_state == STATE_PLAYING:
+            power_up = f"POWER UP: {self.power_up_timer:.1f}s"
+        hud_texts = (self.score, power_up)
+        if hud_texts == self.hud_texts:
+            return False
+        self.hud_texts = hud_texts
+
+        self.screen.blit(self.background, self.hud_rect, self.hud_rect)
+
+        # Draw score
+        score_text = self.text_cache.render(self.font, f"Score: {self.score}", WHITE)
+        self.screen.blit(score_text, (10, 5))
+
+        # Draw power-up timer if active
+        if power_up:
+            timer_text = self.text_cache.render(self.font, power_up, YELLOW)
+            self.screen.blit(timer_text, (self.screen_width - 250, 5))
+        return True
 
     def run(self):
-        """Main game loop"""
+        """Main game loop - fixed simulation steps, rendering at its own pace"""
+        accumulator = 0.0
+        events = None
         while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
+            self.profiler.start_frame()
+            waited = events is not None
+            self.handle_events(events)
+            self.profiler.lap("events")
+
+            # Run as many fixed ticks as fit in the time since the last frame.
+            # Long frames are capped so a lag spike can't snowball, and time
+            # spent sleeping on a static screen is not simulated at all.
+            if not waited:
+                accumulator += min(self.clock.get_time() / 1000.0, MAX_FRAME_TIME)
+            while accumulator >= SIMULATION_DT:
+                self.update(SIMULATION_DT)
+                accumulator -= SIMULATION_DT
+            self.profiler.lap("update")
+
+            # The profiler overlay goes on top, below the score bar
+            dirty_rects = self.render(accumulator / SIMULATION_DT)
+            overlay_rect = self.profiler.draw(self.screen, topleft=(0, SCORE_HEIGHT))
+            if overlay_rect is not None and dirty_rects is not None:
+                dirty_rects.append(overlay_rect)
+            self.profiler.lap("draw")
+            self.present(dirty_rects)
+            self.profiler.lap("flip")
+
+            # Game over and win screens are static: sleep until there is input
+            if self.running and self.game_state != STATE_PLAYING:
+                events = wait_for_events()
+                self.clock.tick()
+            else:
+                events = None
+                self.clock.tick(FPS)
+                self.profiler.lap("tick")
+                self.profiler.end_frame()
+
+        if self.input_log is not None:
+            self.input_log.end_tick = self.tick
 
         pygame.quit()
-        sys.exit()
+
+    def simulate(self, max_ticks=SIMULATION_MAX_TICKS, dt=SIMULATION_DT, agent=None):
+        """
+        Run the game as fast as possible with a fixed dt until it ends.
+        The agent (if any) is called every tick with the game and returns a
+        direction (dx, dy) for Pacman or None to keep the current one.
+        Returns a dict with the final score, ticks survived and outcome.
+        When recording, the agent's directions go into the input log.
+        """
+        input_log = self.input_log
+        if input_log is not None:
+            input_log.dt = dt
+        ticks = 0
+        while self.game_state == STATE_PLAYING and ticks < max_ticks:
+            if agent is not None:
+                direction = agent(self)
+                if direction is not None:
+                    if input_log is not None:
+                        input_log.record(self.tick, DIRECTION_ACTIONS[tuple(direction)])
+                    self.pacman.set_direction(*direction)
+            self.update(dt)
+            ticks += 1
+
+        if input_log is not None:
+            input_log.end_tick = self.tick
+        return {"score": self.score, "ticks": ticks, "outcome": self.outcome()}
+
+    def outcome(self):
+        """How the game ended: won, lost, or timeout if it is still going"""
+        if self.game_state == STATE_WON:
+            return "won"
+        if self.game_state == STATE_GAME_OVER:
+            return "lost"
+        return "timeout"
+
+
+class RandomAgent:
+    """Simple agent for headless games - picks a random direction now and then"""
+
+    def __init__(self, turn_every=15, seed=None):
+        self.turn_every = turn_every
+        self.rng = random.Random(seed)
+        self.ticks = 0
+
+    def __call__(self, game):
+        self.ticks += 1
+        if self.ticks % self.turn_every == 1:
+            return self.rng.choice([(0, -1), (0, 1), (-1, 0), (1, 0)])
+        return None
+
+
+def run_headless(
+    max_ticks=SIMULATION_MAX_TICKS, dt=SIMULATION_DT, agent=None, **game_options
+):
+    """
+    Play one game without a window or audio, returns the simulate() result.
+    game_options are passed on to Game (seed, layout, swarm, ...).
+    """
+    game = Game(headless=True, **game_options)
+    return game.simulate(max_ticks, dt, agent)
+
+
+def add_game_arguments(parser):
+    """Add the maze and ghost options to a command line parser"""
+    parser.add_argument(
+        "--swarm",
+        action="store_true",
+        help="move all ghosts in one vectorised step (needs NumPy)",
+    )
+    parser.add_argument(
+        "--separate-ghosts",
+        action="store_true",
+        help="push overlapping ghosts apart (for mazes crowded with ghosts)",
+    )
+    add_maze_arguments(parser)
+
+
+def game_options_from_args(parser, args):
+    """Game keyword arguments picked with add_game_arguments (exits if invalid)"""
+    try:
+        layout = layout_from_args(args)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    if args.swarm and importlib.util.find_spec("numpy") is None:
+        parser.error("--swarm needs NumPy (pip install numpy)")
+    return {
+        "layout": layout,
+        "swarm": args.swarm,
+        "separate_ghosts": args.separate_ghosts,
+    }
 
 
 def main():
     """Entry point for the game"""
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description="Pac-Man")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="simulate one game without a window or audio and print the result",
+    )
+    parser.add_argument(
+        "--ticks",
+        type=int,
+        default=SIMULATION_MAX_TICKS,
+        help="maximum number of ticks to simulate",
+    )
+    parser.add_argument(
+        "--dt", type=float, default=SIMULATION_DT, help="fixed simulation step (s)"
+    )
+    parser.add_argument("--seed", type=int, help="random seed for the game")
+    parser.add_argument(
+        "--record", metavar="FILE", help="save the session's inputs for replay.py"
+    )
+    parser.add_argument(
+        "--audio-cache",
+        metavar="DIR",
+        help="keep decoded sounds in DIR so later launches start faster",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="save a timeline of every frame (.json for chrome://tracing, "
+        "or .jsonl), the GAME_TRACE variable does the same",
+    )
+    add_game_arguments(parser)
+    args = parser.parse_args()
+    game_options = game_options_from_args(parser, args)
+    tracer = open_tracer(args.trace, "Pac-Man")
+
+    if args.headless:
+        game = Game(
+            headless=True,
+            seed=args.seed,
+            record=args.record is not None,
+            tracer=tracer,
+            **game_options,
+        )
+        result = game.simulate(args.ticks, args.dt, RandomAgent(seed=args.seed))
+        print(
+            f"Outcome: {result['outcome']}, score: {result['score']}, "
+            f"ticks: {result['ticks']}"
+        )
+    else:
+        game = Game(
+            seed=args.seed,
+            record=args.record is not None,
+            audio_cache=args.audio_cache,
+            tracer=tracer,
+            **game_options,
+        )
+        game.run()
+    if args.record:
+        game.input_log.save(args.record)
+        print(f"Inputs recorded to {args.record}")
+
+    if tracer is not None:
+        tracer.close()
+        print(f"Trace written to {tracer.path}")
+    sys.exit()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+"""
+Pac-Man Spatial Hash
+Buckets actors by the maze tile under their centre, so collision tests
+only compare actors that are close to each other instead of every pair.
+
+Actors are never bigger than a tile, so two actors can only touch if
+their centres are on the same tile or on neighbouring tiles. The hash is
+rebuilt every tick, which costs one dictionary insert per actor.
+"""
+
+# Half of the 8 neighbours: visiting these from every tile reaches each
+# pair of neighbouring tiles exactly once
+FORWARD_NEIGHBOURS = [(1, -1), (1, 0), (1, 1), (0, 1)]
+
+
+class SpatialHash:
+    """Tile -> actors whose centre is on that tile"""
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.cells = {}
+
+    def rebuild(self, actors):
+        """Bucket the actors by their current tile"""
+        tile_at = self.maze.tile_at
+        cells = {}
+        for actor in actors:
+            tile = tile_at(*actor.rect.center)
+            bucket = cells.get(tile)
+            if bucket is None:
+                cells[tile] = [actor]
+            else:
+                bucket.append(actor)
+        self.cells = cells
+
+    def near(self, actor):
+        """Actors on the tile under an actor or on the 8 around it"""
+        maze = self.maze
+        col, row = maze.tile_at(*actor.rect.center)
+        # A set, so tiny mazes that wrap onto themselves list a tile once
+        tiles = {
+            ((col + dx) % maze.width, (row + dy) % maze.height)
+            for dx in (-1, 0, 1)
+            for dy in (-1, 0, 1)
+        }
+        nearby = []
+        for tile in tiles:
+            for other in self.cells.get(tile, ()):
+                if other is not actor:
+                    nearby.append(other)
+        return nearby
+
+    def pairs(self):
+        """Every pair of actors on the same tile or on neighbouring tiles, once"""
+        width = self.maze.width
+        height = self.maze.height
+        cells = self.cells
+        for (col, row), bucket in cells.items():
+            for index, actor in enumerate(bucket):
+                for other in bucket[index + 1 :]:
+                    yield actor, other
+            for dx, dy in FORWARD_NEIGHBOURS:
+                others = cells.get(((col + dx) % width, (row + dy) % height))
+                if others is None or others is bucket:
+                    continue
+                for actor in bucket:
+                    for other in others:
+                        yield actor, other
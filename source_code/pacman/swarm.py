@@ -0,0 +1,319 @@
+"""
+Pac-Man Ghost Swarm
+Moves all ghosts in one vectorised NumPy step, for levels with hundreds of
+ghosts where calling Ghost.update() once per ghost is too slow.
+
+The swarm makes the same decisions as Ghost.update(): chase (or flee)
+along the maze's shared distance field, keep going straight on ties,
+choose again at every tile centre passed, and turn to a random open
+direction after running into a wall. The Ghost
+sprites are kept for drawing, the swarm writes their positions back after
+every step.
+
+NumPy is optional: the game only needs it when a swarm is used.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+# Up, down, left, right - the same order Ghost.update() tries them in
+DIRECTIONS_X = (0, 0, -1, 1)
+DIRECTIONS_Y = (-1, 1, 0, 0)
+
+# Vulnerable ghosts change colour this often (seconds)
+COLOR_CYCLE_TIME = 0.2
+
+
+class GhostSwarm:
+    """Positions, directions and speeds of all ghosts in NumPy arrays"""
+
+    def __init__(self, ghosts, maze, top, seed=None):
+        if np is None:
+            raise ImportError("Ghost swarms need NumPy (pip install numpy)")
+        self.ghosts = list(ghosts)
+        self.top = top  # Screen y of the maze's first row
+        self.rng = np.random.default_rng(seed)
+
+        # Per-ghost state, in the same order as self.ghosts
+        self.x = np.array([ghost.x for ghost in self.ghosts], dtype=float)
+        self.y = np.array([ghost.y for ghost in self.ghosts], dtype=float)
+        self.dx = np.array([ghost.dx for ghost in self.ghosts], dtype=np.int64)
+        self.dy = np.array([ghost.dy for ghost in self.ghosts], dtype=np.int64)
+        self.speed = np.array([ghost.speed for ghost in self.ghosts], dtype=float)
+
+        # All ghosts share a size and lookaheads (they come from the same atlas)
+        first = self.ghosts[0] if self.ghosts else None
+        self.size = first.size if first else 0
+        self.margin = first.margin if first else 0
+        self.turn_lookahead = first.turn_lookahead if first else 0
+        self.unstuck_lookahead = first.unstuck_lookahead if first else 0
+
+        self.directions_x = np.array(DIRECTIONS_X)
+        self.directions_y = np.array(DIRECTIONS_Y)
+        self.set_maze(maze)
+
+        # Vulnerable colour cycling is the same for every ghost
+        self.color_timer = 0.0
+        self.color_index = 0
+        self.cycled = False  # Whether ghosts show a vulnerable colour
+
+    def set_maze(self, maze):
+        """Copy the maze's wall grid into an array"""
+        self.maze = maze
+        walls = np.frombuffer(b"".join(maze.walls), dtype=np.uint8)
+        self.walls = walls.reshape(maze.height, maze.width).astype(bool)
+        self.distance_list = None
+        self.distance_grid = None
+
+    def remove(self, ghost):
+        """Drop a ghost (e.g. one that was eaten) from the swarm"""
+        index = self.ghosts.index(ghost)
+        keep = np.arange(len(self.ghosts)) != index
+        del self.ghosts[index]
+        for name in ("x", "y", "dx", "dy", "speed"):
+            setattr(self, name, getattr(self, name)[keep])
+
+    def pull_positions(self, ghosts):
+        """Copy the positions of sprites that were moved outside the swarm"""
+        index = {id(ghost): i for i, ghost in enumerate(self.ghosts)}
+        for ghost in ghosts:
+            i = index[id(ghost)]
+            self.x[i] = ghost.x
+            self.y[i] = ghost.y
+
+    def collides(self, left, top):
+        """For each rect (left, top, size, size), whether it overlaps a wall"""
+        maze = self.maze
+        cell_size = maze.cell_size
+        size = self.size
+        # Ghosts are at most one tile big, so a rect touches at most 2x2 tiles
+        cols = (left // cell_size, (left + size - 1) // cell_size)
+        top = top - self.top
+        rows = (top // cell_size, (top + size - 1) // cell_size)
+        hit = np.zeros(left.shape, dtype=bool)
+        for row in rows:
+            row_inside = (row >= 0) & (row < maze.height)
+            safe_row = np.clip(row, 0, maze.height - 1)
+            for col in cols:
+                inside = row_inside & (col >= 0) & (col < maze.width)
+                safe_col = np.clip(col, 0, maze.width - 1)
+                hit |= inside & self.walls[safe_row, safe_col]
+        return hit
+
+    def distances(self, pacman):
+        """The maze's distance field to Pacman as a (height, width) array"""
+        maze = self.maze
+        distances = maze.distances_from(maze.tile_at(*pacman.rect.center))
+        if distances is not self.distance_list:
+            self.distance_list = distances
+            self.distance_grid = np.array(distances).reshape(maze.height, maze.width)
+        return self.distance_grid
+
+    def update(self, pacman, vulnerable=False, dt=0):
+        """Move every ghost one tick - chase when normal, flee when vulnerable"""
+        if not self.ghosts:
+            return
+        self.update_colors(vulnerable, dt)
+        prev_x = self.x.copy()
+        prev_y = self.y.copy()
+        distances = self.distances(pacman)
+
+        # Like Ghost.update(): a step ends at the next tile centre, where the
+        # ghosts choose again, until each has gone its distance or hit a wall
+        remaining = self.speed * dt
+        moving = np.arange(len(self.ghosts))
+        while moving.size:
+            self.choose_directions(moving, distances, vulnerable)
+            moved, blocked = self.advance(moving, remaining[moving])
+            remaining[moving] -= moved
+            if blocked.any():
+                self.unstick(moving[blocked])
+            moving = moving[~blocked & (remaining[moving] > 0)]
+
+        self.wrap_around(prev_x, prev_y)
+
+    def choose_directions(self, moving, distances, vulnerable):
+        """Turn the given ghosts towards Pacman (away when vulnerable) if open"""
+        maze = self.maze
+        cell_size = maze.cell_size
+        # Rects hold the truncated position, like pygame.Rect does
+        left = np.trunc(self.x[moving]).astype(np.int64)
+        top = np.trunc(self.y[moving]).astype(np.int64)
+        dx = self.dx[moving]
+        dy = self.dy[moving]
+
+        # Score all four directions for all ghosts at once: (ghosts, 4)
+        directions_x = self.directions_x
+        directions_y = self.directions_y
+        turn_open = ~self.collides(
+            left[:, None] + directions_x * self.turn_lookahead,
+            top[:, None] + directions_y * self.turn_lookahead,
+        )
+        # Maze distance from the tile just over half a tile ahead
+        probe_distance = cell_size // 2 + 1
+        center_x = left + self.size // 2
+        center_y = top + self.size // 2
+        probe_cols = (center_x[:, None] + directions_x * probe_distance) // cell_size
+        probe_rows = (
+            center_y[:, None] + directions_y * probe_distance - self.top
+        ) // cell_size
+        distance = distances[probe_rows % maze.height, probe_cols % maze.width]
+        score = (distance if vulnerable else -distance).astype(float)
+        # Prefer to keep moving in the current direction (breaks ties)
+        going_straight = (directions_x == dx[:, None]) & (directions_y == dy[:, None])
+        score += 0.5 * going_straight
+        score[~turn_open | (distance < 0)] = -np.inf
+
+        # argmax picks the first best direction, like the strict > in Ghost
+        best = np.argmax(score, axis=1)
+        found = np.isfinite(score[np.arange(len(best)), best])
+        self.dx[moving] = np.where(found, directions_x[best], dx)
+        self.dy[moving] = np.where(found, directions_y[best], dy)
+
+    def advance(self, moving, distance):
+        """
+        Move the given ghosts up to distance, stopping at the next tile centre
+        or at a wall. Returns the distances moved and which ghosts hit a wall.
+        """
+        cell_size = self.maze.cell_size
+        x = self.x[moving]
+        y = self.y[moving]
+        dx = self.dx[moving]
+        dy = self.dy[moving]
+        vertical = dy != 0
+        direction = np.where(vertical, dy, dx)
+        position = np.where(vertical, y, x)
+
+        # Distance to the next tile centre ahead (Actor.lane_distance)
+        origin = np.where(vertical, self.top, 0) + self.margin
+        offset = (position - origin) % cell_size
+        lane = np.where(
+            direction > 0, cell_size - offset, np.where(offset == 0, cell_size, offset)
+        )
+        step = np.minimum(distance, lane)
+        moved = self.free_distance(x, y, vertical, direction, position, step)
+
+        # Centre lines are whole pixels: land on them exactly
+        position = np.where(
+            moved == lane,
+            np.round(position + direction * lane),
+            position + direction * moved,
+        )
+        self.x[moving] = np.where(vertical, x, position)
+        self.y[moving] = np.where(vertical, position, y)
+        return moved, moved < step
+
+    def free_distance(self, x, y, vertical, direction, position, step):
+        """
+        How far (up to step) each ghost can move before it touches a wall.
+        Steps never pass the next tile centre, so the leading edge of a ghost
+        enters at most one new tile (see Maze.free_distance).
+        """
+        maze = self.maze
+        cell_size = maze.cell_size
+        size = self.size
+        forward = direction > 0
+        origin = np.where(vertical, self.top, 0)
+
+        # Tile of the leading edge before and after the step
+        start = np.trunc(position).astype(np.int64) - origin
+        end = np.trunc(position + direction * step).astype(np.int64) - origin
+        edge_before = np.where(forward, start + size - 1, start) // cell_size
+        edge_after = np.where(forward, end + size - 1, end) // cell_size
+
+        # The 1-2 tiles beside the ghost, across its direction of motion
+        across = np.where(vertical, np.trunc(x), np.trunc(y) - self.top)
+        across = across.astype(np.int64)
+        wall = np.zeros(step.shape, dtype=bool)
+        for side in (across // cell_size, (across + size - 1) // cell_size):
+            row = np.where(vertical, edge_after, side)
+            col = np.where(vertical, side, edge_after)
+            inside = (row >= 0) & (row < maze.height) & (col >= 0) & (col < maze.width)
+            safe_row = np.clip(row, 0, maze.height - 1)
+            safe_col = np.clip(col, 0, maze.width - 1)
+            wall |= inside & self.walls[safe_row, safe_col]
+        wall &= edge_after != edge_before
+
+        # Rects are truncated like pygame.Rect, so wall faces are whole pixels
+        face = np.where(
+            forward,
+            edge_after * cell_size + origin - size,
+            (edge_after + 1) * cell_size + origin,
+        )
+        free = np.where(forward, face - position, position - face)
+        return np.where(wall, np.minimum(step, np.maximum(0.0, free)), step)
+
+    def unstick(self, stuck):
+        """Turn ghosts that hit a wall to a random open direction"""
+        left = np.trunc(self.x[stuck]).astype(np.int64)
+        top = np.trunc(self.y[stuck]).astype(np.int64)
+        # A random order of the four directions per ghost (like a shuffle)
+        order = np.argsort(self.rng.random((len(stuck), 4)), axis=1)
+        open_ = ~self.collides(
+            left[:, None] + self.directions_x[order] * self.unstuck_lookahead,
+            top[:, None] + self.directions_y[order] * self.unstuck_lookahead,
+        )
+        first_open = np.argmax(open_, axis=1)
+        rows = np.arange(len(stuck))
+        turning = open_[rows, first_open]
+        chosen = order[rows, first_open]
+        self.dx[stuck[turning]] = self.directions_x[chosen[turning]]
+        self.dy[stuck[turning]] = self.directions_y[chosen[turning]]
+
+    def wrap_around(self, prev_x, prev_y):
+        """Teleport ghosts through the tunnels, then update the sprites"""
+        maze = self.maze
+        size = self.size
+        left = np.trunc(self.x).astype(np.int64)
+        top = np.trunc(self.y).astype(np.int64)
+
+        x = np.where(left + size < 0, maze.pixel_width, self.x)
+        x = np.where(left > maze.pixel_width, -size, x)
+        y = np.where(top < self.top, maze.pixel_height + self.top - size, self.y)
+        y = np.where(top > maze.pixel_height + self.top, self.top, y)
+        # Teleports are not interpolated across the screen
+        teleported = (x != self.x) | (y != self.y)
+        self.x = x.astype(float)
+        self.y = y.astype(float)
+        prev_x = np.where(teleported, self.x, prev_x)
+        prev_y = np.where(teleported, self.y, prev_y)
+
+        for ghost, ghost_x, ghost_y, ghost_prev_x, ghost_prev_y, dx, dy in zip(
+            self.ghosts,
+            self.x.tolist(),
+            self.y.tolist(),
+            prev_x.tolist(),
+            prev_y.tolist(),
+            self.dx.tolist(),
+            self.dy.tolist(),
+        ):
+            ghost.prev_x = ghost_prev_x
+            ghost.prev_y = ghost_prev_y
+            ghost.move_to(ghost_x, ghost_y)
+            ghost.dx = dx
+            ghost.dy = dy
+
+    def update_colors(self, vulnerable, dt):
+        """Cycle the vulnerable colours of all ghosts together (as Ghost does)"""
+        if vulnerable:
+            self.color_timer += dt
+            if self.color_timer >= COLOR_CYCLE_TIME:
+                self.color_timer = 0.0
+                self.color_index += 1
+                self.cycled = True
+                for ghost in self.ghosts:
+                    colors = ghost.vulnerable_colors
+                    ghost.color = colors[self.color_index % len(colors)]
+                    ghost.image = ghost.atlas.ghost_image(ghost.color)
+        elif self.cycled:
+            # Back to the original colours when not vulnerable
+            self.color_timer = 0.0
+            self.color_index = 0
+            self.cycled = False
+            for ghost in self.ghosts:
+                ghost.color = ghost.original_color
+                ghost.image = ghost.atlas.ghost_image(ghost.color)
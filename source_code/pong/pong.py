@@ -11,9 +11,13 @@ Controls:
 import pygame
 import sys
 import random
+import os
 
-# Initialize PyGame
-pygame.init()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.idle import wait_for_events  # noqa: E402
+from common.profiler import TOGGLE_KEY, FrameProfiler  # noqa: E402
+from common.text_cache import TextCache  # noqa: E402
+from common.tracer import open_tracer  # noqa: E402
 
 # Constants
 SCREEN_WIDTH = 800
@@ -99,12 +103,27 @@ class Game:
     """Main game class."""
 
     def __init__(self):
+        # Start only the PyGame modules the game uses (importing starts none)
+        pygame.display.init()
+        pygame.font.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Pong - Classic Arcade Game")
         self.clock = pygame.time.Clock()
+        # Timeline of the session, only when GAME_TRACE names a file
+        self.tracer = open_tracer(name="Pong")
+        self.profiler = FrameProfiler(tracer=self.tracer)
         self.font = pygame.font.Font(None, 74)
         self.small_font = pygame.font.Font(None, 36)
 
+        # Rendered text is cached, static labels are rendered once up front
+        self.text_cache = TextCache()
+        self.controls_text = self.text_cache.pin(
+            self.small_font, "Player 1: W/S | Player 2: Arrow Keys", GRAY
+        )
+        self.restart_text = self.text_cache.pin(
+            self.small_font, "Press R to restart or ESC to quit", WHITE
+        )
+
         # Game objects
         self.left_paddle = Paddle(50, SCREEN_HEIGHT // 2 - PADDLE_HEIGHT // 2)
         self.right_paddle = Paddle(
@@ -120,14 +139,18 @@ class Game:
         self.game_over = False
         self.winner = None
 
-    def handle_events(self):
-        """Handle user input."""
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        """Handle user input (all queued events unless events are given)."""
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 return False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     return False
+                elif event.key == TOGGLE_KEY:
+                    self.profiler.toggle()
         return True
 
     def handle_input(self):
@@ -171,17 +194,21 @@ class Game:
             # Check for scoring
             if self.ball.rect.left <= 0:
                 self.right_score += 1
+                self.mark("point", player=2)
                 self.ball.reset()
                 if self.right_score >= SCORE_LIMIT:
                     self.game_over = True
                     self.winner = "Player 2"
+                    self.mark("game over", winner=self.winner)
 
             if self.ball.rect.right >= SCREEN_WIDTH:
                 self.left_score += 1
+                self.mark("point", player=1)
                 self.ball.reset()
                 if self.left_score >= SCORE_LIMIT:
                     self.game_over = True
                     self.winner = "Player 1"
+                    self.mark("game over", winner=self.winner)
 
     def draw(self):
         """Draw everything on screen."""
@@ -197,37 +224,37 @@ class Game:
         self.ball.draw(self.screen)
 
         # Draw scores
-        left_text = self.font.render(str(self.left_score), True, WHITE)
-        right_text = self.font.render(str(self.right_score), True, WHITE)
+        left_text = self.text_cache.render(self.font, str(self.left_score), WHITE)
+        right_text = self.text_cache.render(self.font, str(self.right_score), WHITE)
         self.screen.blit(left_text, (SCREEN_WIDTH // 4, 50))
         self.screen.blit(right_text, (3 * SCREEN_WIDTH // 4, 50))
 
         # Draw game over message
         if self.game_over:
-            game_over_text = self.font.render(f"{self.winner} Wins!", True, WHITE)
+            game_over_text = self.text_cache.render(
+                self.font, f"{self.winner} Wins!", WHITE
+            )
             text_rect = game_over_text.get_rect(
                 center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
             )
             self.screen.blit(game_over_text, text_rect)
 
-            restart_text = self.small_font.render(
-                "Press R to restart or ESC to quit", True, WHITE
-            )
-            restart_rect = restart_text.get_rect(
+            restart_rect = self.restart_text.get_rect(
                 center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)
             )
-            self.screen.blit(restart_text, restart_rect)
+            self.screen.blit(self.restart_text, restart_rect)
 
         # Draw controls
-        controls_text = self.small_font.render(
-            "Player 1: W/S | Player 2: Arrow Keys", True, GRAY
-        )
-        self.screen.blit(controls_text, (10, SCREEN_HEIGHT - 30))
+        self.screen.blit(self.controls_text, (10, SCREEN_HEIGHT - 30))
 
-        pygame.display.flip()
+    def mark(self, name, **args):
+        """Add a game event marker to the trace (if tracing)."""
+        if self.tracer is not None:
+            self.tracer.marker(name, **args)
 
     def restart_game(self):
         """Restart the game."""
+        self.mark("restart")
         self.left_score = 0
         self.right_score = 0
         self.game_over = False
@@ -239,10 +266,14 @@ class Game:
     def run(self):
         """Main game loop."""
         running = True
+        events = None
 
         while running:
+            self.profiler.start_frame()
+
             # Handle events
-            running = self.handle_events()
+            running = self.handle_events(events)
+            self.profiler.lap("events")
 
             # Handle restart
             keys = pygame.key.get_pressed()
@@ -252,16 +283,31 @@ class Game:
             if not self.game_over:
                 # Handle input
                 self.handle_input()
+                self.profiler.lap("input")
 
                 # Update game
                 self.update_ball()
+                self.profiler.lap("update")
 
-            # Draw everything
+            # Draw everything, with the profiler overlay on top when shown
             self.draw()
-
-            # Control frame rate
-            self.clock.tick(FPS)
-
+            self.profiler.draw(self.screen, topright=(SCREEN_WIDTH - 10, 10))
+            self.profiler.lap("draw")
+            pygame.display.flip()
+            self.profiler.lap("flip")
+
+            # The game over screen is static: sleep until there is input
+            if running and self.game_over:
+                events = wait_for_events()
+            else:
+                events = None
+                # Control frame rate
+                self.clock.tick(FPS)
+                self.profiler.lap("tick")
+                self.profiler.end_frame()
+
+        if self.tracer is not None:
+            self.tracer.close()
         pygame.quit()
         sys.exit()
 
@@ -0,0 +1,279 @@
+"""
+Snake Autopilots
+Computer players for attract-mode demos and soak tests. An autopilot is
+called every tick with the snake and the food and returns the direction
+to steer in, which the game passes to Snake.change_direction():
+
+- GreedyAutopilot: the shortest path to the food (breadth-first search)
+- AStarAutopilot: the same path, searched with A* towards the food
+- HamiltonianAutopilot: follows a cycle through every cell of the board,
+  taking shortcuts that can never trap it, so it always fills the board
+
+The path finders plan once per food and then follow the plan: the body
+only ever leaves cells, so a path that was clear stays clear. When the
+food can't be reached they make any move that doesn't crash this tick.
+
+Usage:
+    python snake.py --autopilot hamiltonian
+    python snake.py --autopilot astar --size 100 --headless
+"""
+
+import heapq
+from abc import ABC, abstractmethod
+from collections import deque
+
+# Up, down, left, right
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+
+
+def hamiltonian_cycle(width, height):
+    """Cells of a cycle through every cell of the board, in order"""
+    if height % 2 and width % 2 == 0:
+        # Build it on its side, there has to be an even number of rows
+        return [(x, y) for y, x in hamiltonian_cycle(height, width)]
+    if height % 2 or width < 2:
+        raise ValueError(f"No Hamiltonian cycle on a {width}x{height} board")
+    # Along the top row, back and forth over the other columns, then back
+    # up the first column
+    cells = [(x, 0) for x in range(width)]
+    for y in range(1, height):
+        columns = range(width - 1, 0, -1) if y % 2 else range(1, width)
+        cells.extend((x, y) for x in columns)
+    cells.extend((0, y) for y in range(height - 1, 0, -1))
+    return cells
+
+
+def blocked_cells(snake):
+    """Board bytearray (index y * width + x), 1 where the body will still be"""
+    width = snake.width
+    blocked = bytearray(width * snake.height)
+    for x, y in snake.occupied:
+        blocked[y * width + x] = 1
+    if not snake.grow:
+        # The tail moves out of the way this tick
+        tail_x, tail_y = snake.body[-1]
+        blocked[tail_y * width + tail_x] = 0
+    return blocked
+
+
+def safe_direction(snake):
+    """A direction that doesn't crash this tick (the current one if none)"""
+    head_x, head_y = snake.body[0]
+    reverse = (-snake.direction[0], -snake.direction[1])
+    tail = snake.body[-1] if not snake.grow else None
+    for dx, dy in [snake.direction] + DIRECTIONS:
+        if (dx, dy) == reverse:
+            continue
+        cell = (head_x + dx, head_y + dy)
+        if (
+            0 <= cell[0] < snake.width
+            and 0 <= cell[1] < snake.height
+            and (cell not in snake.occupied or cell == tail)
+        ):
+            return (dx, dy)
+    return snake.direction
+
+
+def neighbors(cell, width, last_row):
+    """Indexes of the cells next to a cell (last_row is the last row's first index)"""
+    x = cell % width
+    cells = []
+    if cell >= width:
+        cells.append(cell - width)
+    if cell < last_row:
+        cells.append(cell + width)
+    if x > 0:
+        cells.append(cell - 1)
+    if x < width - 1:
+        cells.append(cell + 1)
+    return cells
+
+
+class PathAutopilot(ABC):
+    """Follows a planned path to the food, planning again for every new food"""
+
+    def __init__(self):
+        self.path = []  # Cells still to visit, the next one last
+        self.target = None  # Food position the path leads to
+
+    def __call__(self, snake, food):
+        head_x, head_y = snake.body[0]
+        if food.position != self.target or not self.next_step_valid(snake):
+            self.target = food.position
+            self.path = [] if food.position is None else self.plan(snake)
+        if not self.path:
+            return safe_direction(snake)
+        x, y = self.path.pop()
+        return (x - head_x, y - head_y)
+
+    def next_step_valid(self, snake):
+        """Whether the next planned cell is still next to the head and free"""
+        if not self.path:
+            return False
+        cell = self.path[-1]
+        head_x, head_y = snake.body[0]
+        if abs(cell[0] - head_x) + abs(cell[1] - head_y) != 1:
+            return False  # Not where the plan expected (e.g. a new game)
+        if cell == snake.body[-1] and not snake.grow:
+            return True  # The tail moves out of the way this tick
+        return cell not in snake.occupied
+
+    @abstractmethod
+    def plan(self, snake):
+        """The path to self.target as cells, the next one last ([] if none)"""
+
+    def start(self, snake):
+        """Search setup: (blocked cells, start index, goal index, width, height)"""
+        width = snake.width
+        blocked = blocked_cells(snake)
+        head_x, head_y = snake.body[0]
+        start = head_y * width + head_x
+        blocked[start] = 1
+        # The snake can't turn back on itself, so the first step can't either
+        back_x = head_x - snake.direction[0]
+        back_y = head_y - snake.direction[1]
+        if 0 <= back_x < width and 0 <= back_y < snake.height:
+            blocked[back_y * width + back_x] = 1
+        goal = self.target[1] * width + self.target[0]
+        return blocked, start, goal, width, snake.height
+
+    @staticmethod
+    def trace_back(parents, goal, start, width):
+        """Follow the parent links from the goal, giving the path next-last"""
+        path = []
+        cell = goal
+        while cell != start:
+            path.append((cell % width, cell // width))
+            cell = parents[cell]
+        return path
+
+
+class GreedyAutopilot(PathAutopilot):
+    """Shortest path to the food by breadth-first search"""
+
+    def plan(self, snake):
+        blocked, start, goal, width, height = self.start(snake)
+        last_row = (height - 1) * width
+        parents = {start: start}
+        frontier = deque([start])
+        while frontier:
+            cell = frontier.popleft()
+            if cell == goal:
+                return self.trace_back(parents, goal, start, width)
+            for neighbor in neighbors(cell, width, last_row):
+                if not blocked[neighbor]:
+                    blocked[neighbor] = 1
+                    parents[neighbor] = cell
+                    frontier.append(neighbor)
+        return []
+
+
+class AStarAutopilot(PathAutopilot):
+    """Shortest path to the food by A* (Manhattan distance heuristic)"""
+
+    def plan(self, snake):
+        blocked, start, goal, width, height = self.start(snake)
+        last_row = (height - 1) * width
+        goal_x, goal_y = self.target
+
+        def estimate(cell):
+            return abs(cell % width - goal_x) + abs(cell // width - goal_y)
+
+        parents = {start: start}
+        costs = {start: 0}
+        # Ties go to the cell closest to the food, so an open board is
+        # crossed without exploring around the path
+        frontier = [(estimate(start), estimate(start), start)]
+        while frontier:
+            _, _, cell = heapq.heappop(frontier)
+            if cell == goal:
+                return self.trace_back(parents, goal, start, width)
+            if blocked[cell] == 2:
+                continue  # Already expanded through a shorter path
+            blocked[cell] = 2
+            cost = costs[cell] + 1
+            for neighbor in neighbors(cell, width, last_row):
+                if blocked[neighbor] == 0 and cost < costs.get(neighbor, cost + 1):
+                    costs[neighbor] = cost
+                    parents[neighbor] = cell
+                    remaining = estimate(neighbor)
+                    heapq.heappush(frontier, (cost + remaining, remaining, neighbor))
+        return []
+
+
+class HamiltonianAutopilot:
+    """
+    Follows a Hamiltonian cycle of the board, cutting ahead along it towards
+    the food while the board is at most half full. The body always lies on
+    the stretch of the cycle from the tail to the head, so cells ahead of
+    the head and before the tail are free. A shortcut keeps a few of those
+    between the head and the tail, so the snake can never trap itself. The
+    board needs an even width or height.
+    """
+
+    # Free cells a shortcut leaves between the head and the tail
+    SHORTCUT_BUFFER = 3
+
+    def __init__(self):
+        self.size = None  # (width, height) the cycle was built for
+        self.order = None  # Cell index (y * width + x) -> position on the cycle
+
+    def prepare(self, width, height):
+        """Build the cycle for a board size"""
+        order = [0] * (width * height)
+        for position, (x, y) in enumerate(hamiltonian_cycle(width, height)):
+            order[y * width + x] = position
+        self.order = order
+        self.size = (width, height)
+
+    def __call__(self, snake, food):
+        width, height = snake.width, snake.height
+        if self.size != (width, height):
+            self.prepare(width, height)
+        order = self.order
+        cells = len(order)
+        body = snake.body
+        head_x, head_y = body[0]
+        head = order[head_y * width + head_x]
+
+        # Distances along the cycle: to the tail (the end of the free stretch)
+        # and to the food (a shortcut shouldn't jump past it)
+        room = cells
+        if len(body) > 1:
+            tail_x, tail_y = body[-1]
+            room = (order[tail_y * width + tail_x] - head) % cells
+        food_distance = cells
+        if food.position is not None:
+            food_x, food_y = food.position
+            food_distance = (order[food_y * width + food_x] - head) % cells
+        furthest = 1
+        if 2 * len(body) <= cells:
+            furthest = max(1, min(room - self.SHORTCUT_BUFFER, food_distance))
+
+        reverse = (-snake.direction[0], -snake.direction[1])
+        best = None  # The furthest allowed cell ahead
+        best_distance = 0
+        nearest = None  # Fallback: the free cell closest along the cycle
+        nearest_distance = cells
+        for dx, dy in DIRECTIONS:
+            x, y = head_x + dx, head_y + dy
+            if (dx, dy) == reverse or not (0 <= x < width and 0 <= y < height):
+                continue
+            distance = (order[y * width + x] - head) % cells
+            if distance == 0 or distance > room:
+                continue
+            if (x, y) in snake.occupied and (distance < room or snake.grow):
+                continue  # Only the tail can be followed, when it moves on
+            if best_distance < distance <= furthest:
+                best, best_distance = (dx, dy), distance
+            if distance < nearest_distance:
+                nearest, nearest_distance = (dx, dy), distance
+        return best or nearest or snake.direction
+
+
+# Name -> autopilot class, for command line options
+AUTOPILOTS = {
+    "greedy": GreedyAutopilot,
+    "astar": AStarAutopilot,
+    "hamiltonian": HamiltonianAutopilot,
+}
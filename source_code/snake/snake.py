@@ -6,14 +6,26 @@ Controls:
 - Arrow keys: Change direction
 - ESC: Quit game
 - R: Restart game
+
+Usage:
+    python snake.py
+    python snake.py --autopilot hamiltonian --size 60
+    python snake.py --autopilot astar --size 500 --headless
 """
 
+import argparse
 import pygame
 import sys
 import random
+import os
+from collections import deque
 
-# Initialize PyGame
-pygame.init()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.idle import wait_for_events  # noqa: E402
+from common.profiler import TOGGLE_KEY, FrameProfiler  # noqa: E402
+from common.text_cache import TextCache  # noqa: E402
+from common.tracer import open_tracer  # noqa: E402
+from autopilot import AUTOPILOTS  # noqa: E402
 
 # Constants
 SCREEN_WIDTH = 600
@@ -25,6 +37,12 @@ GRID_SIZE = 20
 GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE
 GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE
 
+# Headless games stop after this many ticks
+SIMULATION_MAX_TICKS = 1_000_000
+
+# Seconds an autopilot game shows its game over screen before the next one
+ATTRACT_RESTART_DELAY = 3.0
+
 # Colors
 BLACK = (0, 0, 0)
 GREEN = (0, 255, 0)
@@ -33,26 +51,83 @@ WHITE = (255, 255, 255)
 DARK_GREEN = (0, 150, 0)
 
 
+class FreeCells:
+    """The board cells not under the snake, picked at random in constant time.
+
+    The cells are kept in a list, with a map from each cell to its list
+    index. A cell is removed by moving the last cell into its slot.
+    """
+
+    def __init__(self, cells):
+        self.cells = list(cells)
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.index
+
+    def add(self, cell):
+        """Mark a cell as free."""
+        if cell not in self.index:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def discard(self, cell):
+        """Mark a cell as taken (nothing happens if it was not free)."""
+        i = self.index.pop(cell, None)
+        if i is not None:
+            last = self.cells.pop()
+            if last != cell:
+                self.cells[i] = last
+                self.index[last] = i
+
+    def choice(self, rng=random):
+        """A random free cell."""
+        return self.cells[rng.randrange(len(self.cells))]
+
+
 class Snake:
     """Represents the snake in the game."""
 
-    def __init__(self):
-        self.body = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
+    def __init__(self, body=None, width=GRID_WIDTH, height=GRID_HEIGHT):
+        self.width = width  # Board size in cells
+        self.height = height
+        # Segments head first, a deque so moving costs the same at any length
+        if body is None:
+            body = [(width // 2, height // 2)]
+        self.body = deque(body)
+        # Cells under the snake, for constant time collision checks
+        self.occupied = set(self.body)
+        # All other cells of the board, to place food in constant time
+        self.free_cells = FreeCells(
+            (x, y)
+            for y in range(height)
+            for x in range(width)
+            if (x, y) not in self.occupied
+        )
         self.direction = (1, 0)  # Moving right
         self.grow = False
 
     def move(self):
         """Move the snake in the current direction."""
-        head_x, head_y = self.body[0]
+        body = self.body
+        head_x, head_y = body[0]
         new_head = (head_x + self.direction[0], head_y + self.direction[1])
 
-        self.body.insert(0, new_head)
-
+        # The tail moves out first, so the head may follow right behind it
         if not self.grow:
-            self.body.pop()  # Remove tail
+            tail = body.pop()  # Remove tail
+            self.occupied.discard(tail)
+            self.free_cells.add(tail)
         else:
             self.grow = False
 
+        body.appendleft(new_head)
+        self.occupied.add(new_head)
+        self.free_cells.discard(new_head)
+
     def change_direction(self, new_direction):
         """Change snake direction (prevent moving backwards)."""
         # Prevent moving backwards into self
@@ -70,83 +145,123 @@ class Snake:
         # Check wall collision
         if (
             head[0] < 0
-            or head[0] >= GRID_WIDTH
+            or head[0] >= self.width
             or head[1] < 0
-            or head[1] >= GRID_HEIGHT
+            or head[1] >= self.height
         ):
             return True
 
-        # Check self collision
-        if head in self.body[1:]:
+        # Check self collision: the head landed on a cell that was already
+        # occupied, so there are fewer occupied cells than segments
+        if len(self.occupied) < len(self.body):
             return True
 
         return False
 
-    def draw(self, screen):
+    def draw(self, screen, cell_size=GRID_SIZE):
         """Draw the snake on screen."""
         for i, segment in enumerate(self.body):
-            x = segment[0] * GRID_SIZE
-            y = segment[1] * GRID_SIZE
+            x = segment[0] * cell_size
+            y = segment[1] * cell_size
 
             # Head is brighter
             color = GREEN if i == 0 else DARK_GREEN
-            pygame.draw.rect(screen, color, (x, y, GRID_SIZE, GRID_SIZE))
-            pygame.draw.rect(screen, BLACK, (x, y, GRID_SIZE, GRID_SIZE), 1)
+            pygame.draw.rect(screen, color, (x, y, cell_size, cell_size))
+            if cell_size >= 4:  # Outlines would hide tiny cells
+                pygame.draw.rect(screen, BLACK, (x, y, cell_size, cell_size), 1)
 
 
 class Food:
     """Represents the food in the game."""
 
-    def __init__(self):
-        self.position = self.generate_position()
-
-    def generate_position(self):
-        """Generate a random position for food."""
-        x = random.randint(0, GRID_WIDTH - 1)
-        y = random.randint(0, GRID_HEIGHT - 1)
-        return (x, y)
+    def __init__(self, free_cells, rng=random):
+        self.rng = rng  # A game can pass its own seeded generator
+        self.respawn(free_cells)
 
-    def respawn(self, snake_body):
-        """Respawn food in a new position (not on snake)."""
-        while True:
-            self.position = self.generate_position()
-            if self.position not in snake_body:
-                break
+    def respawn(self, free_cells):
+        """Respawn food on a random free cell (None when the board is full)."""
+        self.position = free_cells.choice(self.rng) if free_cells else None
 
-    def draw(self, screen):
+    def draw(self, screen, cell_size=GRID_SIZE):
         """Draw the food on screen."""
-        x = self.position[0] * GRID_SIZE
-        y = self.position[1] * GRID_SIZE
-        pygame.draw.rect(screen, RED, (x, y, GRID_SIZE, GRID_SIZE))
+        if self.position is None:
+            return
+        x = self.position[0] * cell_size
+        y = self.position[1] * cell_size
+        pygame.draw.rect(screen, RED, (x, y, cell_size, cell_size))
 
 
 class Game:
     """Main game class."""
 
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Snake Game")
+    def __init__(
+        self,
+        headless=False,
+        width=GRID_WIDTH,
+        height=GRID_HEIGHT,
+        seed=None,
+        autopilot=None,
+    ):
+        # A headless game has no window, it is played by simulate()
+        self.headless = headless
+        # Board size in cells, drawn as large as the window allows
+        self.width = width
+        self.height = height
+        self.cell_size = max(1, min(SCREEN_WIDTH // width, SCREEN_HEIGHT // height))
+        # All food placement comes from this generator, so a seed replays a game
+        self.rng = random.Random(seed)
+        # Steers the snake every tick when set (see autopilot.py)
+        self.autopilot = autopilot
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
-        self.big_font = pygame.font.Font(None, 72)
+        # Timeline of the session, only when GAME_TRACE names a file
+        self.tracer = None if headless else open_tracer(name="Snake")
+        self.profiler = FrameProfiler(tracer=self.tracer)
+
+        if not headless:
+            # Start only the PyGame modules the game uses (importing starts none)
+            pygame.display.init()
+            pygame.font.init()
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("Snake Game")
+            self.font = pygame.font.Font(None, 36)
+            self.big_font = pygame.font.Font(None, 72)
+
+            # Rendered text is cached, static labels are rendered once up front
+            self.text_cache = TextCache()
+            pin = self.text_cache.pin
+            self.game_over_text = pin(self.big_font, "GAME OVER", WHITE)
+            self.win_text = pin(self.big_font, "YOU WIN!", GREEN)
+            self.restart_text = pin(
+                self.font, "Press R to restart or ESC to quit", WHITE
+            )
+            self.pause_text = pin(self.big_font, "PAUSED", WHITE)
+            self.resume_text = pin(self.font, "Press SPACE to resume", WHITE)
+            self.controls_text = pin(
+                self.font, "Arrow Keys: Move | SPACE: Pause | ESC: Quit", WHITE
+            )
 
         # Game objects
-        self.snake = Snake()
-        self.food = Food()
+        self.snake = Snake(width=width, height=height)
+        self.food = Food(self.snake.free_cells, self.rng)
 
         # Game state
         self.score = 0
         self.game_over = False
+        self.won = False  # The snake filled the whole board
         self.paused = False
 
-    def handle_events(self):
-        """Handle user input."""
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        """Handle user input (all queued events unless events are given)."""
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 return False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     return False
+                elif event.key == TOGGLE_KEY:
+                    self.profiler.toggle()
                 elif event.key == pygame.K_r and self.game_over:
                     self.restart_game()
                 elif event.key == pygame.K_SPACE and not self.game_over:
@@ -163,104 +278,211 @@ class Game:
                         self.snake.change_direction((1, 0))
         return True
 
+    def steer(self):
+        """Let the autopilot (if any) pick the snake's direction."""
+        if self.autopilot is not None and not self.game_over and not self.paused:
+            self.snake.change_direction(self.autopilot(self.snake, self.food))
+
     def update(self):
         """Update game logic."""
         if not self.game_over and not self.paused:
+            tracer = self.tracer
+            if tracer is not None:
+                start = tracer.now()
+
             self.snake.move()
 
             # Check collisions
             if self.snake.check_collision():
                 self.game_over = True
+                self.mark("game over", score=self.score)
                 return
+            if tracer is not None:
+                start = tracer.span("move", start)
 
             # Check food collision
             if self.snake.body[0] == self.food.position:
                 self.snake.grow_snake()
                 self.score += 10
-                self.food.respawn(self.snake.body)
+                self.mark("food eaten", length=len(self.snake.body))
+                self.food.respawn(self.snake.free_cells)
+                if self.food.position is None:
+                    # No free cell left: the snake fills the board
+                    self.game_over = True
+                    self.won = True
+                    self.mark("board full", score=self.score)
+                if tracer is not None:
+                    tracer.span("food", start)
 
     def draw(self):
         """Draw everything on screen."""
         self.screen.fill(BLACK)
 
         # Draw snake and food
-        self.snake.draw(self.screen)
-        self.food.draw(self.screen)
+        self.snake.draw(self.screen, self.cell_size)
+        self.food.draw(self.screen, self.cell_size)
 
         # Draw score
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
+        score_text = self.text_cache.render(self.font, f"Score: {self.score}", WHITE)
         self.screen.blit(score_text, (10, 10))
 
         # Draw game over message
         if self.game_over:
-            game_over_text = self.big_font.render("GAME OVER", True, WHITE)
-            text_rect = game_over_text.get_rect(
-                center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-            )
-            self.screen.blit(game_over_text, text_rect)
+            message = self.win_text if self.won else self.game_over_text
+            text_rect = message.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+            self.screen.blit(message, text_rect)
 
-            restart_text = self.font.render(
-                "Press R to restart or ESC to quit", True, WHITE
-            )
-            restart_rect = restart_text.get_rect(
+            restart_rect = self.restart_text.get_rect(
                 center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)
             )
-            self.screen.blit(restart_text, restart_rect)
+            self.screen.blit(self.restart_text, restart_rect)
 
         # Draw pause message
         if self.paused and not self.game_over:
-            pause_text = self.big_font.render("PAUSED", True, WHITE)
-            text_rect = pause_text.get_rect(
+            text_rect = self.pause_text.get_rect(
                 center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
             )
-            self.screen.blit(pause_text, text_rect)
+            self.screen.blit(self.pause_text, text_rect)
 
-            resume_text = self.font.render("Press SPACE to resume", True, WHITE)
-            resume_rect = resume_text.get_rect(
+            resume_rect = self.resume_text.get_rect(
                 center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)
             )
-            self.screen.blit(resume_text, resume_rect)
+            self.screen.blit(self.resume_text, resume_rect)
 
         # Draw controls
-        controls_text = self.font.render(
-            "Arrow Keys: Move | SPACE: Pause | ESC: Quit", True, WHITE
-        )
-        self.screen.blit(controls_text, (10, SCREEN_HEIGHT - 30))
+        self.screen.blit(self.controls_text, (10, SCREEN_HEIGHT - 30))
 
-        pygame.display.flip()
+    def mark(self, name, **args):
+        """Add a game event marker to the trace (if tracing)."""
+        if self.tracer is not None:
+            self.tracer.marker(name, **args)
 
     def restart_game(self):
         """Restart the game."""
-        self.snake = Snake()
-        self.food = Food()
+        self.mark("restart")
+        self.snake = Snake(width=self.width, height=self.height)
+        self.food = Food(self.snake.free_cells, self.rng)
         self.score = 0
         self.game_over = False
+        self.won = False
         self.paused = False
 
+    def simulate(self, max_ticks=SIMULATION_MAX_TICKS):
+        """
+        Play with the autopilot until the game ends (or max_ticks), as fast
+        as possible: no drawing and no frame limiter.
+        Returns a dict with the outcome, score, snake length and ticks played.
+        """
+        ticks = 0
+        while not self.game_over and ticks < max_ticks:
+            self.steer()
+            self.update()
+            ticks += 1
+        return {
+            "outcome": self.outcome(),
+            "score": self.score,
+            "length": len(self.snake.body),
+            "ticks": ticks,
+        }
+
+    def outcome(self):
+        """How the game ended: won, lost or timeout (still playing)."""
+        if self.won:
+            return "won"
+        return "lost" if self.game_over else "timeout"
+
     def run(self):
         """Main game loop."""
         running = True
+        events = None
 
         while running:
+            self.profiler.start_frame()
+
             # Handle events
-            running = self.handle_events()
+            running = self.handle_events(events)
+            self.profiler.lap("events")
 
-            # Update game
+            # Update game (steered by the autopilot in attract mode)
+            self.steer()
             self.update()
+            self.profiler.lap("update")
 
-            # Draw everything
+            # Draw everything, with the profiler overlay on top when shown
             self.draw()
-
-            # Control frame rate
-            self.clock.tick(FPS)
-
+            self.profiler.draw(self.screen, topright=(SCREEN_WIDTH - 10, 10))
+            self.profiler.lap("draw")
+            pygame.display.flip()
+            self.profiler.lap("flip")
+
+            # Paused and game over screens are static: sleep until there is input
+            if running and self.autopilot is not None and self.game_over:
+                # Attract mode: show the result for a while, then play again
+                events = wait_for_events(ATTRACT_RESTART_DELAY)
+                if not events:
+                    self.restart_game()
+            elif running and (self.paused or self.game_over):
+                events = wait_for_events()
+            else:
+                events = None
+                # Control frame rate
+                self.clock.tick(FPS)
+                self.profiler.lap("tick")
+                self.profiler.end_frame()
+
+        if self.tracer is not None:
+            self.tracer.close()
         pygame.quit()
         sys.exit()
 
 
 def main():
     """Main function."""
-    game = Game()
+    parser = argparse.ArgumentParser(description="Snake")
+    parser.add_argument(
+        "--autopilot",
+        choices=AUTOPILOTS,
+        help="let the computer play (attract mode)",
+    )
+    parser.add_argument(
+        "--size", type=int, default=GRID_WIDTH, help="board width and height in cells"
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="play one autopilot game without a window and print the result",
+    )
+    parser.add_argument(
+        "--ticks",
+        type=int,
+        default=SIMULATION_MAX_TICKS,
+        help="maximum number of ticks of a headless game",
+    )
+    parser.add_argument("--seed", type=int, help="random seed for the food")
+    args = parser.parse_args()
+    if args.size < 2:
+        parser.error("--size must be at least 2")
+    if args.headless and args.autopilot is None:
+        parser.error("--headless needs an --autopilot to play")
+    if args.autopilot == "hamiltonian" and args.size % 2:
+        parser.error("the hamiltonian autopilot needs an even --size")
+
+    game_options = {
+        "width": args.size,
+        "height": args.size,
+        "seed": args.seed,
+        "autopilot": AUTOPILOTS[args.autopilot]() if args.autopilot else None,
+    }
+    if args.headless:
+        game = Game(headless=True, **game_options)
+        result = game.simulate(args.ticks)
+        print(
+            f"Outcome: {result['outcome']}, score: {result['score']}, "
+            f"length: {result['length']}, ticks: {result['ticks']}"
+        )
+        return
+
+    game = Game(**game_options)
     game.run()
 
 
@@ -12,9 +12,13 @@ Controls:
 import pygame
 import sys
 import random
+import os
 
-# Initialize PyGame
-pygame.init()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.idle import wait_for_events  # noqa: E402
+from common.profiler import TOGGLE_KEY, FrameProfiler  # noqa: E402
+from common.text_cache import TextCache  # noqa: E402
+from common.tracer import open_tracer  # noqa: E402
 
 # Constants
 SCREEN_WIDTH = 800
@@ -191,12 +195,29 @@ class Game:
     """Main game class."""
 
     def __init__(self):
+        # Start only the PyGame modules the game uses (importing starts none)
+        pygame.display.init()
+        pygame.font.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Space Invaders")
         self.clock = pygame.time.Clock()
+        # Timeline of the session, only when GAME_TRACE names a file
+        self.tracer = open_tracer(name="Space Invaders")
+        self.profiler = FrameProfiler(tracer=self.tracer)
         self.font = pygame.font.Font(None, 36)
         self.big_font = pygame.font.Font(None, 72)
 
+        # Rendered text is cached, static labels are rendered once up front
+        self.text_cache = TextCache()
+        self.win_text = self.text_cache.pin(self.big_font, "YOU WIN!", GREEN)
+        self.game_over_text = self.text_cache.pin(self.big_font, "GAME OVER", RED)
+        self.restart_text = self.text_cache.pin(
+            self.font, "Press R to restart or ESC to quit", WHITE
+        )
+        self.controls_text = self.text_cache.pin(
+            self.font, "Arrow Keys: Move | SPACE: Shoot | ESC: Quit", WHITE
+        )
+
         # Game objects
         self.player = Player()
         self.alien_grid = AlienGrid()
@@ -207,14 +228,18 @@ class Game:
         self.game_over = False
         self.winner = None
 
-    def handle_events(self):
-        """Handle user input."""
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        """Handle user input (all queued events unless events are given)."""
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 return False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     return False
+                elif event.key == TOGGLE_KEY:
+                    self.profiler.toggle()
                 elif event.key == pygame.K_r and self.game_over:
                     self.restart_game()
                 elif event.key == pygame.K_SPACE and not self.game_over:
@@ -235,11 +260,19 @@ class Game:
     def update(self):
         """Update game logic."""
         if not self.game_over:
+            tracer = self.tracer
+            if tracer is not None:
+                start = tracer.now()
+
             # Update player bullets
             self.player.update_bullets()
+            if tracer is not None:
+                start = tracer.span("player bullets", start)
 
             # Update alien grid
             self.alien_grid.update()
+            if tracer is not None:
+                start = tracer.span("alien grid", start)
 
             # Check bullet collisions
             self.check_bullet_collisions()
@@ -248,6 +281,7 @@ class Game:
             for bullet in self.alien_grid.bullets[:]:
                 if bullet.rect.colliderect(self.player.rect):
                     self.lives -= 1
+                    self.mark("life lost", lives=self.lives)
                     self.alien_grid.bullets.remove(bullet)
                     if self.lives <= 0:
                         self.game_over = True
@@ -264,6 +298,11 @@ class Game:
                 self.game_over = True
                 self.winner = "Player"
 
+            if tracer is not None:
+                tracer.span("collisions", start)
+                if self.game_over:
+                    tracer.marker("game over", winner=self.winner)
+
     def check_bullet_collisions(self):
         """Check collisions between bullets and aliens."""
         for bullet in self.player.bullets[:]:
@@ -272,6 +311,7 @@ class Game:
                     self.player.bullets.remove(bullet)
                     self.alien_grid.aliens.remove(alien)
                     self.score += 10
+                    self.mark("alien hit", aliens_left=len(self.alien_grid.aliens))
                     break
 
     def draw(self):
@@ -293,41 +333,39 @@ class Game:
             bullet.draw(self.screen)
 
         # Draw score and lives
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-        lives_text = self.font.render(f"Lives: {self.lives}", True, WHITE)
+        score_text = self.text_cache.render(self.font, f"Score: {self.score}", WHITE)
+        lives_text = self.text_cache.render(self.font, f"Lives: {self.lives}", WHITE)
         self.screen.blit(score_text, (10, 10))
         self.screen.blit(lives_text, (10, 50))
 
         # Draw game over message
         if self.game_over:
             if self.winner == "Player":
-                game_over_text = self.big_font.render("YOU WIN!", True, GREEN)
+                game_over_text = self.win_text
             else:
-                game_over_text = self.big_font.render("GAME OVER", True, RED)
+                game_over_text = self.game_over_text
 
             text_rect = game_over_text.get_rect(
                 center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
             )
             self.screen.blit(game_over_text, text_rect)
 
-            restart_text = self.font.render(
-                "Press R to restart or ESC to quit", True, WHITE
-            )
-            restart_rect = restart_text.get_rect(
+            restart_rect = self.restart_text.get_rect(
                 center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)
             )
-            self.screen.blit(restart_text, restart_rect)
+            self.screen.blit(self.restart_text, restart_rect)
 
         # Draw controls
-        controls_text = self.font.render(
-            "Arrow Keys: Move | SPACE: Shoot | ESC: Quit", True, WHITE
-        )
-        self.screen.blit(controls_text, (10, SCREEN_HEIGHT - 30))
+        self.screen.blit(self.controls_text, (10, SCREEN_HEIGHT - 30))
 
-        pygame.display.flip()
+    def mark(self, name, **args):
+        """Add a game event marker to the trace (if tracing)."""
+        if self.tracer is not None:
+            self.tracer.marker(name, **args)
 
     def restart_game(self):
         """Restart the game."""
+        self.mark("restart")
         self.player = Player()
         self.alien_grid = AlienGrid()
         self.score = 0
@@ -338,23 +376,42 @@ class Game:
     def run(self):
         """Main game loop."""
         running = True
+        events = None
 
         while running:
+            self.profiler.start_frame()
+
             # Handle events
-            running = self.handle_events()
+            running = self.handle_events(events)
+            self.profiler.lap("events")
 
             # Handle input
             self.handle_input()
+            self.profiler.lap("input")
 
             # Update game
             self.update()
+            self.profiler.lap("update")
 
-            # Draw everything
+            # Draw everything, with the profiler overlay on top when shown
             self.draw()
-
-            # Control frame rate
-            self.clock.tick(FPS)
-
+            self.profiler.draw(self.screen, topright=(SCREEN_WIDTH - 10, 10))
+            self.profiler.lap("draw")
+            pygame.display.flip()
+            self.profiler.lap("flip")
+
+            # The game over screen is static: sleep until there is input
+            if running and self.game_over:
+                events = wait_for_events()
+            else:
+                events = None
+                # Control frame rate
+                self.clock.tick(FPS)
+                self.profiler.lap("tick")
+                self.profiler.end_frame()
+
+        if self.tracer is not None:
+            self.tracer.close()
         pygame.quit()
         sys.exit()
 